@@ -7,61 +7,87 @@ Produced with Claude Code
 
 """
 
+import io
 import os
 import json
 import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Set, Dict, List, Tuple
 
+# Matches technique, mitigation and weakness IDs (e.g. T1000, M1000, W1000)
+ID_PATTERN = re.compile(r'\b([TMW])(1\d{3})\b')
+
+# Default number of issues and of PRs fetched from GitHub. gh pages through
+# results itself, so larger limits only cost extra API pages, not extra processes
+DEFAULT_GITHUB_LIMIT = 100
+
+# jq projection applied by gh: joins title, body and comment bodies into a single
+# 'text' field and drops items that cannot contain an ID, so only the text we
+# actually scan is returned
+GH_JQ_PROJECTION = (
+    'map({number, title, text: ([.title, .body] + [.comments[].body] | map(. // "") | join(" "))})'
+    ' | map(select(.text | test("[TMW]1[0-9]{3}")))'
+)
+
+# ID kinds handled by the scanner: (ID letter, singular name, data folder / plural name)
+ID_KINDS = (
+    ('T', 'technique', 'techniques'),
+    ('M', 'mitigation', 'mitigations'),
+    ('W', 'weakness', 'weaknesses'),
+)
+
+def run_commands_concurrently(commands: List[List[str]]) -> List[str]:
+    """Run all commands at the same time and return their stdout in order.
+
+    Raises subprocess.CalledProcessError if any command fails.
+    """
+    def run(command):
+        return subprocess.run(command, capture_output=True, text=True, check=True).stdout
+
+    with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+        return list(executor.map(run, commands))
+
 class IDScanner:
-    def __init__(self, project_root: str = None):
+    def __init__(self, project_root: str = None, github_limit: int = DEFAULT_GITHUB_LIMIT):
         # If no project_root specified, assume we're in reporting_scripts and go up one level
         if project_root is None:
             project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.project_root = project_root
-        self.technique_ids: Set[int] = set()
-        self.mitigation_ids: Set[int] = set()
-        self.weakness_ids: Set[int] = set()
+        self.github_limit = github_limit
+        # IDs found in local files, keyed by ID letter ('T', 'M', 'W')
+        self.used_ids: Dict[str, Set[int]] = {letter: set() for letter, _, _ in ID_KINDS}
         
-        # IDs found in GitHub issues/PRs but not yet in files
-        # Format: {id: [(issue_number, title, type)]}
-        self.reserved_technique_ids: Dict[int, List[Tuple[int, str, str]]] = {}
-        self.reserved_mitigation_ids: Dict[int, List[Tuple[int, str, str]]] = {}
-        self.reserved_weakness_ids: Dict[int, List[Tuple[int, str, str]]] = {}
+        # IDs found in GitHub issues/PRs but not yet in files, keyed by ID letter
+        # Format: {letter: {id: {(issue_number, title, type)}}}
+        self.reserved_ids: Dict[str, Dict[int, Set[Tuple[int, str, str]]]] = {letter: {} for letter, _, _ in ID_KINDS}
     
+    def _scan_dir(self, dir_path: str, prefix: str, target_set: Set[int]):
+        """Add the numeric part of each '<prefix><digits>.json' filename in dir_path to target_set.
+
+        A missing directory is skipped.
+        """
+        prefix_len = len(prefix)
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith(prefix) and name.endswith(".json"):
+                        core = name[prefix_len:-5]
+                        if core.isdigit():
+                            target_set.add(int(core))
+        except FileNotFoundError:
+            pass
+
     def scan_local_files(self):
         """Scan local JSON files for existing IDs"""
         print("Scanning local files for existing IDs...")
         
-        # Scan techniques
-        technique_dir = os.path.join(self.project_root, "data", "techniques")
-        if os.path.exists(technique_dir):
-            for filename in os.listdir(technique_dir):
-                if filename.startswith("T") and filename.endswith(".json"):
-                    match = re.match(r"T(\d+)\.json", filename)
-                    if match:
-                        self.technique_ids.add(int(match.group(1)))
-        
-        # Scan mitigations
-        mitigation_dir = os.path.join(self.project_root, "data", "mitigations")
-        if os.path.exists(mitigation_dir):
-            for filename in os.listdir(mitigation_dir):
-                if filename.startswith("M") and filename.endswith(".json"):
-                    match = re.match(r"M(\d+)\.json", filename)
-                    if match:
-                        self.mitigation_ids.add(int(match.group(1)))
+        for letter, _, folder in ID_KINDS:
+            self._scan_dir(os.path.join(self.project_root, "data", folder), letter, self.used_ids[letter])
         
-        # Scan weaknesses
-        weakness_dir = os.path.join(self.project_root, "data", "weaknesses")
-        if os.path.exists(weakness_dir):
-            for filename in os.listdir(weakness_dir):
-                if filename.startswith("W") and filename.endswith(".json"):
-                    match = re.match(r"W(\d+)\.json", filename)
-                    if match:
-                        self.weakness_ids.add(int(match.group(1)))
-        
-        print(f"Found {len(self.technique_ids)} techniques, {len(self.mitigation_ids)} mitigations, {len(self.weakness_ids)} weaknesses")
+        print("Found " + ", ".join(f"{len(self.used_ids[letter])} {plural}" for letter, _, plural in ID_KINDS))
     
     def scan_github_issues_prs(self):
         """Scan GitHub issues and PRs for ID assignments"""
@@ -79,75 +105,39 @@ class IDScanner:
                 print("Continuing with local file scan only...")
                 return
             
-            # Get issues with comments
-            issues_result = subprocess.run(
-                ["gh", "issue", "list", "--limit", "100", "--json", "number,title,body,comments", "--state", "all"],
-                capture_output=True, text=True, check=True
-            )
-            issues = json.loads(issues_result.stdout)
-            
-            # Get PRs with comments
-            prs_result = subprocess.run(
-                ["gh", "pr", "list", "--limit", "100", "--json", "number,title,body,comments", "--state", "all"],
-                capture_output=True, text=True, check=True
-            )
-            prs = json.loads(prs_result.stdout)
+            # Get issues and PRs with comments (both gh calls run concurrently,
+            # each paginating up to the configured limit)
+            limit = str(self.github_limit)
+            issues_output, prs_output = run_commands_concurrently([
+                ["gh", "issue", "list", "--limit", limit, "--json", "number,title,body,comments", "--state", "all",
+                 "--jq", GH_JQ_PROJECTION],
+                ["gh", "pr", "list", "--limit", limit, "--json", "number,title,body,comments", "--state", "all",
+                 "--jq", GH_JQ_PROJECTION],
+            ])
+            issues = json.loads(issues_output)
+            prs = json.loads(prs_output)
             
             # Process issues first, then PRs
             for items, item_type in [(issues, "issue"), (prs, "PR")]:
                 for item in items:
                     number = item.get('number', 0)
                     title = item.get('title', '')
-                    body = item.get('body', '')
                     
-                    # Collect comment text
-                    comment_text = ""
-                    comments = item.get('comments', [])
-                    for comment in comments:
-                        comment_body = comment.get('body', '')
-                        comment_text += f" {comment_body}"
+                    # Title, body and comment text already joined by the jq projection
+                    text_to_search = item.get('text', '')
                     
-                    text_to_search = f"{title} {body} {comment_text}"
-                    
-                    # Find technique IDs (T1000-T9999, excluding obvious test cases like T9999)
-                    t_matches = re.findall(r'\bT(1\d{3})\b', text_to_search)
-                    for match in t_matches:
-                        tid = int(match)
+                    # Find technique, mitigation and weakness IDs in one pass
+                    for letter, match in ID_PATTERN.findall(text_to_search):
+                        found_id = int(match)
                         # Skip obvious test/placeholder IDs
-                        if tid == 9999:
+                        if letter == 'T' and found_id == 9999:
                             continue
-                        if tid not in self.technique_ids:
-                            if tid not in self.reserved_technique_ids:
-                                self.reserved_technique_ids[tid] = []
-                            # Avoid duplicates from same issue/PR
-                            if (number, title, item_type) not in self.reserved_technique_ids[tid]:
-                                self.reserved_technique_ids[tid].append((number, title, item_type))
-                    
-                    # Find mitigation IDs (M1000-M9999, excluding single digits)
-                    m_matches = re.findall(r'\bM(1\d{3})\b', text_to_search)
-                    for match in m_matches:
-                        mid = int(match)
-                        if mid not in self.mitigation_ids:
-                            if mid not in self.reserved_mitigation_ids:
-                                self.reserved_mitigation_ids[mid] = []
-                            # Avoid duplicates from same issue/PR
-                            if (number, title, item_type) not in self.reserved_mitigation_ids[mid]:
-                                self.reserved_mitigation_ids[mid].append((number, title, item_type))
-                    
-                    # Find weakness IDs (W1000-W9999, excluding single digits)
-                    w_matches = re.findall(r'\bW(1\d{3})\b', text_to_search)
-                    for match in w_matches:
-                        wid = int(match)
-                        if wid not in self.weakness_ids:
-                            if wid not in self.reserved_weakness_ids:
-                                self.reserved_weakness_ids[wid] = []
-                            # Avoid duplicates from same issue/PR
-                            if (number, title, item_type) not in self.reserved_weakness_ids[wid]:
-                                self.reserved_weakness_ids[wid].append((number, title, item_type))
+                        if found_id not in self.used_ids[letter]:
+                            # Set membership avoids duplicates from same issue/PR
+                            self.reserved_ids[letter].setdefault(found_id, set()).add((number, title, item_type))
             
-            print(f"Found {len(self.reserved_technique_ids)} reserved technique IDs, " +
-                  f"{len(self.reserved_mitigation_ids)} reserved mitigation IDs, " +
-                  f"{len(self.reserved_weakness_ids)} reserved weakness IDs in GitHub")
+            print("Found " + ", ".join(f"{len(self.reserved_ids[letter])} reserved {singular} IDs"
+                                       for letter, singular, _ in ID_KINDS) + " in GitHub")
             
         except FileNotFoundError:
             print("Warning: GitHub CLI (gh) not found.")
@@ -172,23 +162,17 @@ class IDScanner:
             print(f"Warning: Unexpected error while fetching GitHub data: {e}")
             print("Continuing with local file scan only...")
     
-    def find_gaps(self, used_ids: Set[int], reserved_ids: Dict[int, List[Tuple[int, str, str]]]) -> List[int]:
+    def find_gaps(self, used_ids: Set[int], reserved_ids: Dict[int, Set[Tuple[int, str, str]]]) -> List[int]:
         """Find gaps in the ID sequence"""
         all_used = used_ids | set(reserved_ids.keys())
         if not all_used:
             return []
         
-        gaps = []
-        min_id = min(all_used)
-        max_id = max(all_used)
-        
-        for i in range(min_id, max_id + 1):
-            if i not in all_used:
-                gaps.append(i)
-        
-        return gaps
+        # Set difference against the full range runs in C rather than a Python loop
+        full_range = set(range(min(all_used), max(all_used) + 1))
+        return sorted(full_range - all_used)
     
-    def find_next_available(self, used_ids: Set[int], reserved_ids: Dict[int, List[Tuple[int, str, str]]], count: int = 5) -> List[int]:
+    def find_next_available(self, used_ids: Set[int], reserved_ids: Dict[int, Set[Tuple[int, str, str]]], count: int = 5) -> List[int]:
         """Find the next available IDs after the highest used ID"""
         all_used = used_ids | set(reserved_ids.keys())
         if not all_used:
@@ -205,101 +189,78 @@ class IDScanner:
         
         return next_ids
     
+    def id_range(self, ids: Set[int]) -> Tuple:
+        """Return (lowest, highest) ID found in a single pass, or ('N/A', 'N/A') if there are none"""
+        if not ids:
+            return 'N/A', 'N/A'
+        iterator = iter(ids)
+        lowest = highest = next(iterator)
+        for each_id in iterator:
+            if each_id < lowest:
+                lowest = each_id
+            elif each_id > highest:
+                highest = each_id
+        return lowest, highest
+    
     def generate_report(self) -> str:
         """Generate a comprehensive report of ID usage and availability"""
-        report = []
-        report.append("SOLVE-IT ID Usage Report")
-        report.append("=" * 50)
-        report.append("")
+        report = io.StringIO()
+        print("SOLVE-IT ID Usage Report", file=report)
+        print("=" * 50, file=report)
+        print(file=report)
         
         # Current usage summary
-        report.append("Current Usage:")
-        report.append(f"  Techniques: {len(self.technique_ids)} IDs (T{min(self.technique_ids) if self.technique_ids else 'N/A'} - T{max(self.technique_ids) if self.technique_ids else 'N/A'})")
-        report.append(f"  Mitigations: {len(self.mitigation_ids)} IDs (M{min(self.mitigation_ids) if self.mitigation_ids else 'N/A'} - M{max(self.mitigation_ids) if self.mitigation_ids else 'N/A'})")
-        report.append(f"  Weaknesses: {len(self.weakness_ids)} IDs (W{min(self.weakness_ids) if self.weakness_ids else 'N/A'} - W{max(self.weakness_ids) if self.weakness_ids else 'N/A'})")
-        report.append("")
+        print("Current Usage:", file=report)
+        for letter, _, plural in ID_KINDS:
+            used_ids = self.used_ids[letter]
+            lowest, highest = self.id_range(used_ids)
+            print(f"  {plural.capitalize()}: {len(used_ids)} IDs ({letter}{lowest} - {letter}{highest})", file=report)
+        print(file=report)
         
         # Reserved IDs from GitHub
-        if self.reserved_technique_ids or self.reserved_mitigation_ids or self.reserved_weakness_ids:
-            report.append("Reserved IDs (from GitHub issues/PRs):")
+        if any(self.reserved_ids.values()):
+            print("Reserved IDs (from GitHub issues/PRs):", file=report)
             
-            if self.reserved_technique_ids:
-                report.append("  Techniques:")
-                for tid in sorted(self.reserved_technique_ids.keys()):
-                    sources = self.reserved_technique_ids[tid]
-                    for number, title, item_type in sources:
+            for letter, _, plural in ID_KINDS:
+                reserved_ids = self.reserved_ids[letter]
+                if not reserved_ids:
+                    continue
+                print(f"  {plural.capitalize()}:", file=report)
+                for reserved_id in sorted(reserved_ids.keys()):
+                    for number, title, item_type in sorted(reserved_ids[reserved_id]):
                         # Truncate title if too long
                         display_title = title[:60] + "..." if len(title) > 60 else title
-                        report.append(f"    T{tid}: {item_type} #{number} - {display_title}")
-            
-            if self.reserved_mitigation_ids:
-                report.append("  Mitigations:")
-                for mid in sorted(self.reserved_mitigation_ids.keys()):
-                    sources = self.reserved_mitigation_ids[mid]
-                    for number, title, item_type in sources:
-                        display_title = title[:60] + "..." if len(title) > 60 else title
-                        report.append(f"    M{mid}: {item_type} #{number} - {display_title}")
-            
-            if self.reserved_weakness_ids:
-                report.append("  Weaknesses:")
-                for wid in sorted(self.reserved_weakness_ids.keys()):
-                    sources = self.reserved_weakness_ids[wid]
-                    for number, title, item_type in sources:
-                        display_title = title[:60] + "..." if len(title) > 60 else title
-                        report.append(f"    W{wid}: {item_type} #{number} - {display_title}")
+                        print(f"    {letter}{reserved_id}: {item_type} #{number} - {display_title}", file=report)
             
-            report.append("")
-        
-        # Find gaps and next available IDs
-        technique_gaps = self.find_gaps(self.technique_ids, self.reserved_technique_ids)
-        mitigation_gaps = self.find_gaps(self.mitigation_ids, self.reserved_mitigation_ids)
-        weakness_gaps = self.find_gaps(self.weakness_ids, self.reserved_weakness_ids)
-        
-        technique_next = self.find_next_available(self.technique_ids, self.reserved_technique_ids)
-        mitigation_next = self.find_next_available(self.mitigation_ids, self.reserved_mitigation_ids)
-        weakness_next = self.find_next_available(self.weakness_ids, self.reserved_weakness_ids)
+            print(file=report)
         
         # Available IDs section
-        report.append("Available IDs:")
-        report.append("")
-        
-        report.append("TECHNIQUES:")
-        if technique_gaps:
-            report.append(f"  Available gaps: T{', T'.join(map(str, technique_gaps[:10]))}")
-            if len(technique_gaps) > 10:
-                report.append(f"  (and {len(technique_gaps) - 10} more gaps)")
-        else:
-            report.append("  No gaps found in sequence")
-        report.append(f"  Next available: T{', T'.join(map(str, technique_next))}")
-        report.append("")
-        
-        report.append("MITIGATIONS:")
-        if mitigation_gaps:
-            report.append(f"  Available gaps: M{', M'.join(map(str, mitigation_gaps[:10]))}")
-            if len(mitigation_gaps) > 10:
-                report.append(f"  (and {len(mitigation_gaps) - 10} more gaps)")
-        else:
-            report.append("  No gaps found in sequence")
-        report.append(f"  Next available: M{', M'.join(map(str, mitigation_next))}")
-        report.append("")
+        print("Available IDs:", file=report)
+        print(file=report)
         
-        report.append("WEAKNESSES:")
-        if weakness_gaps:
-            report.append(f"  Available gaps: W{', W'.join(map(str, weakness_gaps[:10]))}")
-            if len(weakness_gaps) > 10:
-                report.append(f"  (and {len(weakness_gaps) - 10} more gaps)")
-        else:
-            report.append("  No gaps found in sequence")
-        report.append(f"  Next available: W{', W'.join(map(str, weakness_next))}")
-        report.append("")
+        next_ids = {}
+        for letter, _, plural in ID_KINDS:
+            gaps = self.find_gaps(self.used_ids[letter], self.reserved_ids[letter])
+            next_ids[letter] = self.find_next_available(self.used_ids[letter], self.reserved_ids[letter])
+            
+            print(f"{plural.upper()}:", file=report)
+            if gaps:
+                print(f"  Available gaps: {letter}{f', {letter}'.join(map(str, gaps[:10]))}", file=report)
+                if len(gaps) > 10:
+                    print(f"  (and {len(gaps) - 10} more gaps)", file=report)
+            else:
+                print("  No gaps found in sequence", file=report)
+            print(f"  Next available: {letter}{f', {letter}'.join(map(str, next_ids[letter]))}", file=report)
+            print(file=report)
         
         # Quick reference for next single ID
-        report.append("QUICK REFERENCE - Next Single ID:")
-        report.append(f"  Next Technique:  T{technique_next[0] if technique_next else 'N/A'}")
-        report.append(f"  Next Mitigation: M{mitigation_next[0] if mitigation_next else 'N/A'}")
-        report.append(f"  Next Weakness:   W{weakness_next[0] if weakness_next else 'N/A'}")
+        print("QUICK REFERENCE - Next Single ID:", file=report)
+        for letter, singular, _ in ID_KINDS:
+            label = f"{singular.capitalize()}:"
+            print(f"  Next {label:<12}{letter}{next_ids[letter][0] if next_ids[letter] else 'N/A'}", file=report)
         
-        return "\n".join(report)
+        # Drop the newline after the final line
+        return report.getvalue()[:-1]
     
     def run(self):
         """Run the complete ID scanning process"""
@@ -309,8 +270,9 @@ class IDScanner:
 
 def main():
     if len(sys.argv) > 1 and sys.argv[1] in ['-h', '--help']:
-        print("Usage: python find_next_ids.py [project_root]")
+        print("Usage: python find_next_ids.py [project_root] [--limit N]")
         print("  project_root: Path to SOLVE-IT project (default: auto-detect from script location)")
+        print(f"  --limit N: Maximum number of issues and of PRs to fetch from GitHub (default: {DEFAULT_GITHUB_LIMIT})")
         print("")
         print("This script scans for existing technique, mitigation, and weakness IDs")
         print("both in local files and GitHub issues/PRs, then reports the next")
@@ -323,9 +285,20 @@ def main():
         print("When run from reporting_scripts/ folder, it automatically detects the project root.")
         return
     
-    project_root = sys.argv[1] if len(sys.argv) > 1 else None
+    args = sys.argv[1:]
+    github_limit = DEFAULT_GITHUB_LIMIT
+    if '--limit' in args:
+        limit_index = args.index('--limit')
+        try:
+            github_limit = int(args[limit_index + 1])
+        except (IndexError, ValueError):
+            print("Error: --limit requires a whole number")
+            sys.exit(1)
+        del args[limit_index:limit_index + 2]
+    
+    project_root = args[0] if args else None
     
-    scanner = IDScanner(project_root)
+    scanner = IDScanner(project_root, github_limit)
     report = scanner.run()
     print(report)
 
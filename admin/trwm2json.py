@@ -6,35 +6,75 @@ import io
 import logging
 import sys
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 logging.basicConfig(encoding='utf-8', level=logging.INFO)
 
+# Detects multiple quoted CSV fields separated by comma and optional whitespace
+CSV_QUOTED_PAIR_PATTERN = re.compile(r'"[^"]*",\s*"[^"]*"')
+
+# csv.reader options used for comma separated list fields
+CSV_FIELD_FORMAT = dict(delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL, skipinitialspace=True)
+
+# Fields (lower case) whose data is parsed into a list, for each type of TSV
+TECHNIQUE_LIST_FIELDS = frozenset({'synonyms', 'subtechniques', 'examples', 'references', 'case_output_classes'})
+MITIGATION_LIST_FIELDS = frozenset({'references'})
+WEAKNESS_LIST_FIELDS = frozenset({'references'})
+
+# Characters a value accepted by json.loads can start with (including NaN and Infinity)
+JSON_START_CHARS = '[{"-0123456789tfnNI'
+
+
+def build_mitigation_name_index(mitigations_list):
+    """Return a dict mapping case-folded, stripped mitigation names to mitigation IDs.
+
+    If a name appears more than once the first mitigation wins, matching find_mitigation_id_by_name.
+    """
+    name_to_id = {}
+    for mitigation in mitigations_list:
+        if 'name' in mitigation and 'id' in mitigation:
+            name_to_id.setdefault(mitigation['name'].strip().casefold(), mitigation['id'])
+    return name_to_id
+
+
+def find_mitigation_columns(headers):
+    """Return the indices of the mitigation columns (headers containing "mitigation")"""
+    return [i for i, header in enumerate(headers) if 'mitigation' in header.lower()]
+
+
+def process_weakness_mitigations(weakness_row, headers, mitigations_list, name_to_id=None, mitigation_columns=None):
+    """Process mitigation columns in a weakness row and return list of mitigation IDs
+
+    name_to_id and mitigation_columns can be passed in (see build_mitigation_name_index and
+    find_mitigation_columns) so they are only computed once when processing many rows.
+    """
+    if name_to_id is None:
+        name_to_id = build_mitigation_name_index(mitigations_list)
 
-def process_weakness_mitigations(weakness_row, headers, mitigations_list):
-    """Process mitigation columns in a weakness row and return list of mitigation IDs"""
-    mitigation_ids = []
-    
     # Find mitigation columns (columns that start with "Mitigation")
-    mitigation_columns = []
-    for i, header in enumerate(headers):
-        if 'mitigation' in header.lower():
-            mitigation_columns.append(i)
+    if mitigation_columns is None:
+        mitigation_columns = find_mitigation_columns(headers)
     
-    logging.debug(f"Found mitigation columns: {[headers[i] for i in mitigation_columns]}")
+    # Debug messages are only formatted when debug logging is on, as this runs for every weakness row
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    if debug:
+        logging.debug(f"Found mitigation columns: {[headers[i] for i in mitigation_columns]}")
     
-    # Process each mitigation column
-    for col_index in mitigation_columns:
-        if col_index < len(weakness_row):
-            mitigation_name = weakness_row[col_index].strip()
-            if mitigation_name:  # Skip empty cells
-                mitigation_id = find_mitigation_id_by_name(mitigation_name, mitigations_list)
-                if mitigation_id:
-                    mitigation_ids.append(mitigation_id)
-                    logging.debug(f"Mapped '{mitigation_name}' -> {mitigation_id}")
-                else:
-                    logging.warning(f"Could not find mitigation ID for: '{mitigation_name}'")
+    # Names in the non-empty mitigation cells, and the ID each one maps to (None if not found)
+    row_length = len(weakness_row)
+    mitigation_names = [name for name in (weakness_row[i].strip() for i in mitigation_columns if i < row_length) if name]
+    found_ids = [name_to_id.get(name.casefold()) for name in mitigation_names]
+    
+    # The names are only walked again to log them, or when some were not found
+    if debug or not all(found_ids):
+        for mitigation_name, mitigation_id in zip(mitigation_names, found_ids):
+            if not mitigation_id:
+                logging.warning(f"Could not find mitigation ID for: '{mitigation_name}'")
+            elif debug:
+                logging.debug(f"Mapped '{mitigation_name}' -> {mitigation_id}")
+        return [mitigation_id for mitigation_id in found_ids if mitigation_id]
     
-    return mitigation_ids
+    return found_ids
 
 
 def find_mitigation_id_by_name(mitigation_name, mitigations_list):
@@ -42,12 +82,11 @@ def find_mitigation_id_by_name(mitigation_name, mitigations_list):
     if not mitigation_name or not mitigation_name.strip():
         return None
     
-    search_name = mitigation_name.strip().lower()
+    search_name = mitigation_name.strip().casefold()
     
     for mitigation in mitigations_list:
         if 'name' in mitigation and 'id' in mitigation:
-            mitigation_name_lower = mitigation['name'].strip().lower()
-            if mitigation_name_lower == search_name:
+            if mitigation['name'].strip().casefold() == search_name:
                 logging.debug(f"Found mitigation '{mitigation_name}' -> ID: {mitigation['id']}")
                 return mitigation['id']
     
@@ -57,50 +96,70 @@ def find_mitigation_id_by_name(mitigation_name, mitigations_list):
 
 def parse_field_data(field_name, data):
     """Parse field data using JSON -> CSV -> Plain text priority"""
-    # check if field is already json:
-    try:
-        decoded_json = json.loads(data)
-        logging.debug(f"decoded {field_name} as JSON")
-        # For reference fields, ensure we return a list even if JSON is a single string
-        if isinstance(decoded_json, str):
-            return [decoded_json]
-        else:
-            return decoded_json
-    except json.JSONDecodeError:
-        logging.debug(data)
-        # Check if it's simple text in quotes (single quoted field with no CSV separators)
-        # Use regex to detect multiple quoted CSV fields separated by comma and optional whitespace
-        csv_pattern = r'"[^"]*",\s*"[^"]*"'
-        if data.strip().startswith('"') and data.strip().endswith('"') and not re.search(csv_pattern, data):
-            # Single quoted field - return as single item list 
-            if data.strip().strip('"'):
-                result = [data.strip().strip('"')]             
+    # check if field is already json (only attempted when the first character could start a
+    # JSON value, as most fields are plain text and a failed json.loads is comparatively slow):
+    first_char = data.lstrip()[:1]
+    if first_char and first_char in JSON_START_CHARS:
+        try:
+            decoded_json = json.loads(data)
+            logging.debug(f"decoded {field_name} as JSON")
+            # For reference fields, ensure we return a list even if JSON is a single string
+            if isinstance(decoded_json, str):
+                return [decoded_json]
             else:
-                result = []
-            logging.debug(f"decoded {field_name} as single quoted CSV")
-            return result
+                return decoded_json
+        except json.JSONDecodeError:
+            pass
 
-        # Then try CSV decoding        
-        try:
-            csv_reader = csv.reader(io.StringIO(data), delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL, skipinitialspace=True)
+    logging.debug(data)
+    # Check if it's simple text in quotes (single quoted field with no CSV separators)
+    stripped_data = data.strip()
+    if stripped_data.startswith('"') and stripped_data.endswith('"') and not CSV_QUOTED_PAIR_PATTERN.search(data):
+        # Single quoted field - return as single item list 
+        unquoted_data = stripped_data.strip('"')
+        if unquoted_data:
+            result = [unquoted_data]             
+        else:
+            result = []
+        logging.debug(f"decoded {field_name} as single quoted CSV")
+        return result
+
+    # Then try CSV decoding        
+    try:
+        if '\n' not in data and '\r' not in data:
+            # Single line (as all TSV cells are), so parse it directly as the reader's only row
+            csv_row = next(csv.reader([data], **CSV_FIELD_FORMAT), [])
+        else:
+            csv_reader = csv.reader(io.StringIO(data), **CSV_FIELD_FORMAT)
             csv_rows = list(csv_reader)
             csv_row = []
             for row in csv_rows:
                 csv_row.extend(row)
-            # If we get multiple fields, it's CSV
-            logging.debug(f"trying to decode {field_name} as CSV")
+        # If we get multiple fields, it's CSV
+        logging.debug(f"trying to decode {field_name} as CSV")
+
+        if len(csv_row) > 1:
+            result = [item.strip() for item in csv_row if item.strip()]
+            logging.debug(f"decoded {field_name} as CSV")
+            return result
+        else:
+            # Single field or not CSV, continue to text processing
+            raise StopIteration
+    except (StopIteration, csv.Error):
+        # not CSV, return as plain text
+        logging.debug(f"decoding {field_name} as plain text")
+        return [data]
 
-            if len(csv_row) > 1:
-                result = [item.strip() for item in csv_row if item.strip()]
-                logging.debug(f"decoded {field_name} as CSV")
-                return result
-            else:
-                # Single field or not CSV, continue to text processing
-                raise StopIteration
-        except (StopIteration, csv.Error):
-            # not CSV, return as plain text
-            logging.debug(f"decoding {field_name} as plain text")
-            return [data]
+
+def read_tsv_rows(file):
+    """Yield each line of an unquoted TSV file as a list of cells.
+
+    Gives the same rows as csv.reader(file, delimiter='\\t', quoting=csv.QUOTE_NONE), but as a
+    plain split without going through the csv parser.
+    """
+    for line in file:
+        line = line.rstrip('\r\n')
+        yield line.split('\t') if line else []
 
 
 def technique_tsv_to_json(tsv_path):
@@ -113,8 +172,7 @@ def technique_tsv_to_json(tsv_path):
                 field_name = parts[0].strip().rstrip(':')
                 data = parts[1].strip()
                 
-                fields_to_process_as_lists = ['synonyms', 'subtechniques', 'examples', 'references', 'case_output_classes']
-                if field_name.lower() in fields_to_process_as_lists:                    
+                if field_name.lower() in TECHNIQUE_LIST_FIELDS:                    
                     result[field_name] = parse_field_data(field_name, data)                        
                 else:
                     result[field_name] = data
@@ -126,8 +184,8 @@ def technique_tsv_to_json(tsv_path):
     if "subtechniques" not in result:
         result["subtechniques"] = []
 
-    # Validate that technique ID is not blank or default placeholder
-    if not result.get('id') or result['id'].strip() == '' or result['id'] == 'Txxxx':
+    # Validate that technique ID is not blank or default placeholder (data is already stripped)
+    if result['id'] in ('', 'Txxxx'):
         print(f"ERROR: Technique ID is blank in file: {tsv_path}", file=sys.stderr)
         sys.exit(1)
 
@@ -137,24 +195,34 @@ def technique_tsv_to_json(tsv_path):
 def mitigations_tsv_to_json(tsv_path):
     mitigations = []
     headers = []
+    blank_id_lines = []
     
     with open(tsv_path, 'r', encoding='utf-8') as file:
-        reader = csv.reader(file, delimiter='\t', quoting=csv.QUOTE_NONE)
+        reader = read_tsv_rows(file)
         
         # Read header row
         headers = next(reader)
         headers = [header.strip() for header in headers]
         logging.debug(f"Headers: {headers}")
         
-        # Process each data row
-        for row in reader:
+        # Work out once how each column is handled: 'list', 'technique', or None for other plain text
+        column_kinds = []
+        for header in headers:
+            if header.lower() in MITIGATION_LIST_FIELDS:
+                column_kinds.append('list')
+            elif header.lower() == 'technique':
+                column_kinds.append('technique')
+            else:
+                column_kinds.append(None)
+        
+        # Process each data row (the header is line 1)
+        for line_number, row in enumerate(reader, start=2):
             if len(row) >= len(headers):
+                # Strip each cell once up front
+                stripped_row = [cell.strip() for cell in row]
                 mitigation = {}
-                for i, header in enumerate(headers):
-                    data = row[i].strip() if i < len(row) else ""
-                    
-                    fields_to_process_as_lists = ['references']
-                    if header.lower() in fields_to_process_as_lists:
+                for header, kind, data in zip(headers, column_kinds, stripped_row):
+                    if kind == 'list':
                         if data:
                             mitigation[header] = parse_field_data(header, data)
                         else:
@@ -162,90 +230,122 @@ def mitigations_tsv_to_json(tsv_path):
                     else:
                         # Store as plain text for other fields
                         # Skip empty technique fields
-                        if header.lower() == 'technique' and not data:
+                        if kind == 'technique' and not data:
                             continue
                         mitigation[header] = data
                         logging.debug(f"storing {header} as plain text")
                 
-                # Validate that mitigation ID is not blank
-                if not mitigation.get('id') or mitigation['id'].strip() == '':
-                    print(f"ERROR: Mitigation ID is blank in file: {tsv_path}", file=sys.stderr)
-                    sys.exit(1)
+                # Validate that mitigation ID is not blank (data is already stripped). Every
+                # blank ID is reported before exiting, so they can all be fixed in one go
+                if not mitigation.get('id'):
+                    print(f"ERROR: Mitigation ID is blank in file: {tsv_path} (line {line_number})", file=sys.stderr)
+                    blank_id_lines.append(line_number)
+                    continue
                 
                 logging.debug(f"Finished processing {mitigation['id']}")
                 mitigations.append(mitigation)
     
+    if blank_id_lines:
+        sys.exit(1)
+
     return mitigations
     
 
 def weaknesses_tsv_to_json(tsv_path, mitigations_list=None):
     weaknesses = []
+    blank_id_lines = []
     flag_columns = ['INCOMP', 'INAC-EX', 'INAC-ALT', 'INAC-AS', 'INAC-COR', 'MISINT']
     
     with open(tsv_path, 'r', encoding='utf-8') as file:
-        reader = csv.reader(file, delimiter='\t', quoting=csv.QUOTE_NONE)
+        reader = read_tsv_rows(file)
         
         # Read header row
         headers = next(reader)
         headers = [header.strip() for header in headers]
         logging.debug(f"Weakness headers: {headers}")
         
-        # Process each data row
-        for row in reader:
+        # Work out once how each column is handled: 'id', 'name', 'flag', 'list', or None for
+        # Summary and the individual Mitigation columns, which are skipped here and processed separately
+        column_kinds = []
+        for header in headers:
+            if header in ('id', 'name'):
+                column_kinds.append(header)
+            elif header in flag_columns:
+                column_kinds.append('flag')
+            elif header.lower() in WEAKNESS_LIST_FIELDS:
+                column_kinds.append('list')
+            else:
+                column_kinds.append(None)
+        
+        # Mitigation lookup table and columns only need working out once for the whole file
+        if mitigations_list:
+            name_to_id = build_mitigation_name_index(mitigations_list)
+            mitigation_columns = find_mitigation_columns(headers)
+        
+        # Process each data row (the header is line 1)
+        for line_number, row in enumerate(reader, start=2):
             if len(row) >= 2:
+                # Strip each cell once; the same values are used for the fields and the mitigations
+                stripped_row = [cell.strip() for cell in row]
+
                 # Check for blank IDs, but allow placeholder rows
-                id_field = row[0].strip()
+                id_field = stripped_row[0]
                 if not id_field or id_field == '-':
                     # Check if this is a placeholder row (name field is also empty/dash)
-                    name_field = row[1].strip() if len(row) > 1 else ""
+                    name_field = stripped_row[1]
                     if not name_field or name_field == '-':
                         continue  # Skip placeholder rows
                     else:
-                        # This has a blank ID but non-empty name - this is an error
-                        print(f"ERROR: Weakness ID is blank in file: {tsv_path}", file=sys.stderr)
-                        sys.exit(1)
+                        # This has a blank ID but non-empty name - this is an error. Every
+                        # blank ID is reported before exiting, so they can all be fixed in one go
+                        print(f"ERROR: Weakness ID is blank in file: {tsv_path} (line {line_number})", file=sys.stderr)
+                        blank_id_lines.append(line_number)
+                        continue
                 
                 weakness = {}
                 
-                # Process each column based on header
-                for i, header in enumerate(headers):
-                    if i >= len(row):
+                # Process each column based on its kind (zip stops at the end of a short row)
+                for header, kind, data in zip(headers, column_kinds, stripped_row):
+                    if kind is None:
                         continue
-                        
-                    data = row[i].strip()
-                    
-                    fields_to_process_as_lists = ['references']
-                    if header == 'id':
-                        weakness['id'] = data
-                        logging.debug(f"storing id as plain text: {data}")
-                    elif header == 'name':
-                        weakness['name'] = data
-                        logging.debug(f"storing name as plain text: {data}")
-                    elif header in flag_columns:
+                    elif kind == 'flag':
                         # Flag columns: "X" becomes "x", empty becomes ""
                         weakness[header] = data.lower() if data.upper() == 'X' else ""
                         logging.debug(f"storing {header} flag: {weakness[header]}")
-                    elif header.lower() in fields_to_process_as_lists:
+                    elif kind == 'list':
                         # Use parse_field_data for list fields
                         if data:
                             weakness[header] = parse_field_data(header, data)
                         else:
                             weakness[header] = []
-                    # Skip Summary and individual Mitigation columns - we'll process them separately
+                    else:
+                        weakness[header] = data
+                        logging.debug(f"storing {header} as plain text: {data}")
                 
                 # Process mitigation columns and add mitigations field
                 if mitigations_list:
-                    weakness['mitigations'] = process_weakness_mitigations(row, headers, mitigations_list)
+                    weakness['mitigations'] = process_weakness_mitigations(stripped_row, headers, mitigations_list,
+                                                                         name_to_id, mitigation_columns)
                 else:
                     weakness['mitigations'] = []
                 
                 if weakness:  # Only add if we have data
                     weaknesses.append(weakness)
     
+    if blank_id_lines:
+        sys.exit(1)
+
     return weaknesses
 
 
 
+def write_json_file(path, data):
+    """Write data to path as indented JSON, keeping non-ASCII characters as UTF-8 like the data folder files.
+
+    The document is encoded in one go and written with a single call rather than streamed in small chunks.
+    """
+    with open(path, 'w', encoding='utf-8') as output_file:
+        output_file.write(json.dumps(data, indent=2, ensure_ascii=False))
 
 
 def main():
@@ -289,36 +389,40 @@ def main():
     # Write JSON files
     print("\nWriting JSON files...")
     
-    # Write technique JSON file using the technique ID
+    # Work out every output file first. Keyed by path so that, as when writing them one
+    # after another, a later object with the same ID replaces an earlier one
+    files_to_write = {}
+    saved_messages = []
+
+    # Technique JSON file using the technique ID
     technique_id = technique_json.get('id', 'unknown')
     technique_filename = f"{technique_id}.json"
     technique_path = os.path.join(args.output, technique_filename)
+    files_to_write[technique_path] = technique_json
+    saved_messages.append(f"Technique JSON saved to: {technique_path}")
     
-    with open(technique_path, 'w', encoding='utf-8') as output_file:
-        json.dump(technique_json, output_file, indent=2)
-    print(f"Technique JSON saved to: {technique_path}")
-    
-    # Write individual mitigation JSON files
-    print(f"Writing {len(mitigations_json)} mitigation files...")
+    # Individual mitigation JSON files
+    saved_messages.append(f"Writing {len(mitigations_json)} mitigation files...")
     for mitigation in mitigations_json:
         mitigation_id = mitigation.get('id', 'unknown')
         mitigation_filename = f"{mitigation_id}.json"
-        mitigation_path = os.path.join(args.output, mitigation_filename)
-        
-        with open(mitigation_path, 'w', encoding='utf-8') as output_file:
-            json.dump(mitigation, output_file, indent=2)
-        print(f"  Mitigation {mitigation_id} saved to: {mitigation_filename}")
+        files_to_write[os.path.join(args.output, mitigation_filename)] = mitigation
+        saved_messages.append(f"  Mitigation {mitigation_id} saved to: {mitigation_filename}")
     
-    # Write individual weakness JSON files
-    print(f"Writing {len(weaknesses_json)} weakness files...")
+    # Individual weakness JSON files
+    saved_messages.append(f"Writing {len(weaknesses_json)} weakness files...")
     for weakness in weaknesses_json:
         weakness_id = weakness.get('id', 'unknown')
         weakness_filename = f"{weakness_id}.json"
-        weakness_path = os.path.join(args.output, weakness_filename)
-        
-        with open(weakness_path, 'w', encoding='utf-8') as output_file:
-            json.dump(weakness, output_file, indent=2)
-        print(f"  Weakness {weakness_id} saved to: {weakness_filename}")
+        files_to_write[os.path.join(args.output, weakness_filename)] = weakness
+        saved_messages.append(f"  Weakness {weakness_id} saved to: {weakness_filename}")
+
+    # Each file is independent of the others, so they are written concurrently
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(write_json_file, files_to_write.keys(), files_to_write.values()))
+
+    for message in saved_messages:
+        print(message)
     
     print(f"\nAll files written to output directory: {args.output}")
 
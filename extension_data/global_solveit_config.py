@@ -1,20 +1,51 @@
+import weakref
+
+# Cache of technique status per knowledge base, so each technique is only
+# classified once however many times its colour/prefix is requested.
+# Keyed weakly on the kb so the cache goes away with it.
+_technique_status_cache = weakref.WeakKeyDictionary()
 
 
 """
-This provides default code for determining what colour is used 
-for presenting techniques in the main list of techniques.
+This provides default code for classifying how well developed a technique is.
+Returns one of 'placeholder', 'partial' or 'ok'.
 """
-def get_colour_for_technique(kb, t_id):
+def get_technique_status(kb, t_id):
+    statuses = _technique_status_cache.setdefault(kb, {})
+    status = statuses.get(t_id)
+    if status is not None:
+        return status
+
     t = kb.get_technique(t_id)
-    
-    # checks number of weaknesses and returns 
-    # a different colour for those with zero
-    # (as a proxy for how well developed the 
+
+    # checks number of weaknesses and returns
+    # a different status for those with zero
+    # (as a proxy for how well developed the
     # technique is)
 
-    if len(t.get('weaknesses')) == 0:
+    # cheap checks first: the mitigation list is only built when the
+    # technique has weaknesses and a description
+    if not t.get('weaknesses'):
+        status = "placeholder"
+    elif not t.get('description') or not kb.get_mit_list_for_technique(t_id):
+        status = "partial"
+    else:
+        status = "ok"
+
+    statuses[t_id] = status
+    return status
+
+
+"""
+This provides default code for determining what colour is used
+for presenting techniques in the main list of techniques.
+"""
+def get_colour_for_technique(kb, t_id):
+    status = get_technique_status(kb, t_id)
+
+    if status == "placeholder":
         return "#F4CCCC" # consider this as placeholder
-    elif (t.get('description') is None or t.get('description') == "") or len(kb.get_mit_list_for_technique(t_id)) == 0:
+    elif status == "partial":
         return "#FCE5CD" # consider this as partially populated
     else:
         return "#D9EAD3" # consider this as a release candidate
@@ -24,11 +55,11 @@ def get_colour_for_technique(kb, t_id):
 This provides default code for determining what prefix is added to techniques in the main list
 """
 def get_technique_prefix(kb, t_id):
-    t = kb.get_technique(t_id)
+    status = get_technique_status(kb, t_id)
 
-    if len(t.get('weaknesses')) == 0:
+    if status == "placeholder":
         return "🔴 " # consider this as placeholder
-    elif (t.get('description') is None or t.get('description') == "") or len(kb.get_mit_list_for_technique(t_id)) == 0:
+    elif status == "partial":
         return "🟡 " # consider this as partially populated
     else:
         return "🟢 " # consider this as a release candidate
@@ -35,6 +35,23 @@ def lighten_color(hex_color, factor=0.5):
     # Convert back to hex
     return f"#{r:02X}{g:02X}{b:02X}"
 
+def get_technique_cell_format(workbook, colour, format_cache):
+    """
+    Returns the cell format used for techniques in the main sheet with the given background colour.
+    Formats are created once per unique colour and reused from format_cache.
+    """
+    the_format = format_cache.get(colour)
+    if the_format is None:
+        the_format = workbook.add_format()
+        the_format.set_bold(False)
+        the_format.set_align('vcenter')
+        the_format.set_align('center')
+        the_format.set_border(style=1)
+        the_format.set_text_wrap()
+        the_format.set_bg_color(colour)
+        format_cache[colour] = the_format
+    return the_format
+
 def format_headings_in_workbook(workbook, objectives):
     header_format = workbook.add_format()
     header_format.set_bold()
@@ -123,7 +140,6 @@ if __name__ == '__main__':
 
     # Adds a worksheet per technique
     for each_technique_id in sorted(kb.list_techniques()):
-        technique_name = kb.get_technique(each_technique_id).get('name')
         workbook.add_worksheet(each_technique_id)
 
     # Adds all the techniques to the main numeric technique sheet
@@ -138,10 +154,11 @@ if __name__ == '__main__':
         if each_technique != "T1000":
             techniques_sheet.write_url(i, 0, 'internal:{}!A1'.format(each_technique),
                                              string=each_technique)
-            techniques_sheet.write_string(i, 1, kb.get_technique(each_technique).get('name'))
-            techniques_sheet.write_number(i, 2, len(kb.get_technique(each_technique).get('weaknesses', [])))
+            technique = kb.get_technique(each_technique)
+            techniques_sheet.write_string(i, 1, technique.get('name'))
+            techniques_sheet.write_number(i, 2, len(technique.get('weaknesses', [])))
             total_mits = 0
-            for each_weakness in kb.get_technique(each_technique).get('weaknesses', []):
+            for each_weakness in technique.get('weaknesses', []):
                 weakness_obj = kb.get_weakness(each_weakness)
                 if weakness_obj is None:
                     logging.error(f'Weakness {each_weakness} not found for technique {each_technique} - Excel generation failed')
@@ -170,8 +187,8 @@ if __name__ == '__main__':
 
             techniques_sorted_sheet.write_string(i, 0, each_objective.get('name'))
             techniques_sorted_sheet.write_url(i, 1, 'internal:{}!A1'.format(each_technique_id), string=each_technique_id)
-            techniques_sorted_sheet.write_string(i, 2, kb.get_technique(each_technique_id).get('name'))
-            techniques_sorted_sheet.write_string(i, 3, kb.get_technique(each_technique_id).get('description'))            
+            techniques_sorted_sheet.write_string(i, 2, t.get('name'))
+            techniques_sorted_sheet.write_string(i, 3, t.get('description'))            
             i = i + 1
 
             # process subtechniques too
@@ -179,8 +196,8 @@ if __name__ == '__main__':
                 s = kb.get_technique(each_sub_id)                
                 techniques_sorted_sheet.write_string(i, 0, each_objective.get('name'))
                 techniques_sorted_sheet.write_url(i, 1, 'internal:{}!A1'.format(each_sub_id), string=each_sub_id + '(s)')
-                techniques_sorted_sheet.write_string(i, 2, kb.get_technique(each_sub_id).get('name'))
-                techniques_sorted_sheet.write_string(i, 3, kb.get_technique(each_sub_id).get('description'))            
+                techniques_sorted_sheet.write_string(i, 2, s.get('name'))
+                techniques_sorted_sheet.write_string(i, 3, s.get('description'))            
                 i = i + 1
 
     print("- populated 'all techniques (sorted)' worksheet")
@@ -190,10 +207,11 @@ if __name__ == '__main__':
         if each_technique != "T1000":
             techniques_sheet.write_url(i, 0, 'internal:{}!A1'.format(each_technique),
                                              string=each_technique)
-            techniques_sheet.write_string(i, 1, kb.get_technique(each_technique).get('name'))
-            techniques_sheet.write_number(i, 2, len(kb.get_technique(each_technique).get('weaknesses', [])))
+            technique = kb.get_technique(each_technique)
+            techniques_sheet.write_string(i, 1, technique.get('name'))
+            techniques_sheet.write_number(i, 2, len(technique.get('weaknesses', [])))
             total_mits = 0
-            for each_weakness in kb.get_technique(each_technique).get('weaknesses', []):
+            for each_weakness in technique.get('weaknesses', []):
                 weakness_obj = kb.get_weakness(each_weakness)
                 if weakness_obj is None:
                     logging.error(f'Weakness {each_weakness} not found for technique {each_technique} - Excel generation failed')
@@ -207,26 +225,27 @@ if __name__ == '__main__':
 
     # Adds all the weaknesses to the main weakness sheet
     for i, each_weakness in enumerate(sorted(kb.list_weaknesses())):
+        weakness = kb.get_weakness(each_weakness)
         weaknesses_sheet.write_string(i+1, 0, each_weakness)
-        weaknesses_sheet.write_string(i+1, 1, kb.get_weakness(each_weakness).get('name'))
-        weaknesses_sheet.write_number(i+1, 2, len(kb.get_weakness(each_weakness).get('mitigations', [])))
-        if len(kb.get_weakness(each_weakness).get('mitigations', [])) == 0:
+        weaknesses_sheet.write_string(i+1, 1, weakness.get('name'))
+        weaknesses_sheet.write_number(i+1, 2, len(weakness.get('mitigations', [])))
+        if len(weakness.get('mitigations', [])) == 0:
             weaknesses_sheet.write_string(i+1, 3, "x")
         techniques_for_weakness = kb.get_techniques_for_weakness(each_weakness)
         technique_ids = [t['id'] for t in techniques_for_weakness]
         weaknesses_sheet.write_string(i + 1, 4, str(technique_ids))
 
-        if kb.get_weakness(each_weakness).get('INCOMP') in ['x', 'X']:
+        if weakness.get('INCOMP') in ['x', 'X']:
             weaknesses_sheet.write_string(i + 1, 5, 'X')
-        if kb.get_weakness(each_weakness).get('INAC_EX') in ['x', 'X']:
+        if weakness.get('INAC_EX') in ['x', 'X']:
             weaknesses_sheet.write_string(i + 1, 6, 'X')
-        if kb.get_weakness(each_weakness).get('INAC_ALT') in ['x', 'X']:
+        if weakness.get('INAC_ALT') in ['x', 'X']:
             weaknesses_sheet.write_string(i + 1, 7, 'X')
-        if kb.get_weakness(each_weakness).get('INAC_AS') in ['x', 'X']:
+        if weakness.get('INAC_AS') in ['x', 'X']:
             weaknesses_sheet.write_string(i + 1, 8, 'X')
-        if kb.get_weakness(each_weakness).get('INAC_COR') in ['x', 'X']:
+        if weakness.get('INAC_COR') in ['x', 'X']:
             weaknesses_sheet.write_string(i + 1, 9, 'X')
-        if kb.get_weakness(each_weakness).get('MISINT') in ['x', 'X']:
+        if weakness.get('MISINT') in ['x', 'X']:
             weaknesses_sheet.write_string(i + 1, 10, 'X')
 
     # write some headers for weakness sheet
@@ -315,6 +334,9 @@ if __name__ == '__main__':
 
     techniques_added = []
 
+    # one cell format per background colour, shared by all technique cells
+    technique_cell_formats = {}
+
     total_techniques_with_weaknesses = 0
 
     for each_objective in kb.tactics:
@@ -337,16 +359,10 @@ if __name__ == '__main__':
                     if len(each_technique['weaknesses']) > 0:
                         total_techniques_with_weaknesses += 1
 
-                    # Create a new format for each cell to have its own independent color
-                    the_format = workbook.add_format()
-                    the_format.set_bold(False)
-                    the_format.set_align('vcenter')
-                    the_format.set_align('center')
-                    the_format.set_border(style=1)
-                    the_format.set_text_wrap()
-
                     # Fetch colour to use using global extension configuration...
-                    the_format.set_bg_color(global_solveit_config.get_colour_for_technique(kb, each_technique_id))
+                    the_format = get_technique_cell_format(workbook,
+                                                           global_solveit_config.get_colour_for_technique(kb, each_technique_id),
+                                                           technique_cell_formats)
                         
                     main_worksheet.write_url(row, column, 'internal:{}!A1'.format(each_technique_id),
                                              string=technique_name + '\n' + each_technique_id,
@@ -362,17 +378,11 @@ if __name__ == '__main__':
                             raise ValueError(f'Subtechnqiue {each_subtechnique_id} not found (referred to in {each_technique_id}).')
                             sys.exit(-1)
 
-                        # Create a new format for each cell to have its own independent color
-                        the_format_sub = workbook.add_format()
-                        the_format_sub.set_bold(False)
-                        the_format_sub.set_align('vcenter')
-                        the_format_sub.set_align('center')
-                        the_format_sub.set_border(style=1)
-                        the_format_sub.set_text_wrap()
-
                         # Fetch colour to use using global extension configuration...
                         base_colour = global_solveit_config.get_colour_for_technique(kb, each_subtechnique_id)
-                        the_format_sub.set_bg_color(lighten_color(base_colour, factor=0.3))
+                        the_format_sub = get_technique_cell_format(workbook,
+                                                                   lighten_color(base_colour, factor=0.3),
+                                                                   technique_cell_formats)
 
 
                         main_worksheet.write_url(row, column, 'internal:{}!A1'.format(each_subtechnique.get('id')),
@@ -408,25 +418,33 @@ if __name__ == '__main__':
 
     # ----------------------------------------------------------------------------------------------------------------
     print('Adding the individual techniques sheets...')
-    for each_technique_id in kb.list_techniques():
-        technique_name = kb.get_technique(each_technique_id).get('name')
 
-        # find tactics that it belongs to
-        parent_tactics = []
-        for each_objective in kb.tactics:
-            if each_technique_id in each_objective.get('techniques'):
+    # map each technique to the tactics it is listed under in a single pass
+    tactics_for_technique = {}
+    for each_objective in kb.tactics:
+        for each_technique_id in each_objective.get('techniques'):
+            parent_tactics = tactics_for_technique.setdefault(each_technique_id, [])
+            if each_objective.get('name') not in parent_tactics:
                 parent_tactics.append(each_objective.get('name'))
 
-        worksheet = workbook.get_worksheet_by_name(each_technique_id)
+    # formats shared by all individual technique sheets
+    technique_list_format = workbook.add_format()
+    technique_list_format.set_text_wrap()
+    technique_list_format.set_align('left')
+    technique_list_format.set_align('vcenter')
+
+    bold_format = workbook.add_format()
+    bold_format.set_bold()
+    bold_format.set_text_wrap()
 
-        technique_list_format = workbook.add_format()
-        technique_list_format.set_text_wrap()
-        technique_list_format.set_align('left')
-        technique_list_format.set_align('vcenter')
+    for each_technique_id in kb.list_techniques():
+        technique = kb.get_technique(each_technique_id)
+        technique_name = technique.get('name')
+
+        # find tactics that it belongs to
+        parent_tactics = tactics_for_technique.get(each_technique_id, [])
 
-        bold_format = workbook.add_format()
-        bold_format.set_bold()
-        bold_format.set_text_wrap()
+        worksheet = workbook.get_worksheet_by_name(each_technique_id)
 
         worksheet.write_url(0, 2, 'internal:Main!A1', string='back to main')
 
@@ -443,26 +461,26 @@ if __name__ == '__main__':
         worksheet.write_string(2, 1, str(parent_tactics))
 
         worksheet.write_string(3, 0, 'Description: ', bold_format)
-        description = kb.get_technique(each_technique_id).get('description') or ''
+        description = technique.get('description') or ''
         worksheet.write_string(3, 1, description, cell_format=technique_list_format)
         worksheet.write_string(4, 0, 'Synonyms: ', bold_format)
-        synonyms = kb.get_technique(each_technique_id).get('synonyms') or []
+        synonyms = technique.get('synonyms') or []
         worksheet.write_string(4, 1, pprint.pformat(synonyms), cell_format=technique_list_format)
         worksheet.write_string(5, 0, 'Details: ', bold_format)
-        details = kb.get_technique(each_technique_id).get('details') or ''
+        details = technique.get('details') or ''
         worksheet.write_string(5, 1, details, cell_format=technique_list_format)
         worksheet.write_string(6, 0, 'Subtechniques: ', bold_format)
-        subtechniques = kb.get_technique(each_technique_id).get('subtechniques') or []
+        subtechniques = technique.get('subtechniques') or []
         
         sub_techniques_out = [sub_t + ':' + kb.get_technique(sub_t).get('name') for sub_t in subtechniques]
         worksheet.write_string(6, 1, pprint.pformat(sub_techniques_out), cell_format=technique_list_format)
 
         worksheet.write_string(7, 0, 'CASE output entities: ', bold_format)        
-        case_output = kb.get_technique(each_technique_id).get('CASE_output_classes') or []
+        case_output = technique.get('CASE_output_classes') or []
         worksheet.write_string(7, 1, pprint.pformat(case_output), cell_format=technique_list_format)
 
         worksheet.write_string(8, 0, 'Examples: ', bold_format)
-        examples = kb.get_technique(each_technique_id).get('examples') or []
+        examples = technique.get('examples') or []
         worksheet.write_string(8, 1, pprint.pformat(examples), cell_format=technique_list_format)
 
         worksheet.write_string(10, 0, 'Potential Weaknesses:', bold_format)
@@ -481,7 +499,7 @@ if __name__ == '__main__':
         i = 0
         mit_list_for_this_technique = []
         err_list_start_row = 12
-        for each_weakness in kb.get_technique(each_technique_id).get('weaknesses'):
+        for each_weakness in technique.get('weaknesses'):
             weakness_info = kb.get_weakness(each_weakness)
 
             try:
@@ -528,13 +546,14 @@ if __name__ == '__main__':
         for each_mit in sorted(mits_written):
             worksheet.write_string(mitigation_start_row + i, 0, each_mit)
             try:
-                if kb.get_mitigation(each_mit).get('technique') is not None: # there is a link to a technique
-                    cell_str = kb.get_mitigation(each_mit).get('name')  + ' ({})'.format( kb.get_mitigation(each_mit).get('technique'))
-                    worksheet.write_url(mitigation_start_row + i, 1, 'internal:{}!A1'.format(kb.get_mitigation(each_mit).get('technique')),
+                mit_obj = kb.get_mitigation(each_mit)
+                if mit_obj.get('technique') is not None: # there is a link to a technique
+                    cell_str = mit_obj.get('name')  + ' ({})'.format(mit_obj.get('technique'))
+                    worksheet.write_url(mitigation_start_row + i, 1, 'internal:{}!A1'.format(mit_obj.get('technique')),
                                         string=cell_str,
                                         cell_format=technique_format)
                 else:
-                    worksheet.write_string(mitigation_start_row + i, 1, kb.get_mitigation(each_mit).get('name'), cell_format=technique_list_format)
+                    worksheet.write_string(mitigation_start_row + i, 1, mit_obj.get('name'), cell_format=technique_list_format)
             except AttributeError:
                 print("Mitigation not found '{}'".format(each_mit))
                 quit()
@@ -548,7 +567,7 @@ if __name__ == '__main__':
         # build big refs dict:
         references = {}
         # References from Technique
-        technique_refs = kb.get_technique(each_technique_id).get('references') or []
+        technique_refs = technique.get('references') or []
         for each_reference in technique_refs:
             if each_reference in references:
                 if each_technique_id not in references[each_reference]:
@@ -557,7 +576,7 @@ if __name__ == '__main__':
                 references[each_reference] = [each_technique_id,]
 
         # References from weaknesses within technique
-        technique_weaknesses = kb.get_technique(each_technique_id).get('weaknesses', [])
+        technique_weaknesses = technique.get('weaknesses', [])
         for each_weakness_id in technique_weaknesses:
             weakness_refs = kb.get_weakness(each_weakness_id).get('references') or []
             for each_reference in weakness_refs:
@@ -1,9 +1,10 @@
+import io
 import sys
 import os
 import argparse
 import logging
-import re
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from solve_it_library import KnowledgeBase, SOLVEITDataError
@@ -36,39 +37,56 @@ def main():
     # Display information about configured extensions
     kb.display_extension_info()
 
-    # Determine and if necessary create output folder path
+    # Determine output folder path
     if args.output_file is not None:
         out_folder = os.path.dirname(args.output_file)
-        if not os.path.exists(out_folder):
-            os.makedirs(out_folder)
         outpath = args.output_file
     else:
         out_folder = 'output'
-        if not os.path.exists(out_folder):
-            os.mkdir(out_folder)
         outpath = os.path.join(out_folder, 'solve-it.md')
 
-    # Create subfolder for technique, weakness, and mitigation files
+    # Create output folder and its subfolder for technique, weakness, and mitigation files
     os.makedirs(os.path.join(out_folder, "md_content"), exist_ok=True)
 
     # This section does the MD generation:
 
-    create_main_markdown(kb, outpath)
+    try:
+        create_main_markdown(kb, outpath)
 
-    write_all_technique_files(kb, outpath)
-    write_all_weakness_files(kb, outpath)
-    write_all_mitigation_files(kb, outpath)
+        write_all_technique_files(kb, outpath)
+        write_all_weakness_files(kb, outpath)
+        write_all_mitigation_files(kb, outpath)
+    except SOLVEITDataError as e:
+        logging.error(f"{e}, exiting")
+        sys.exit(-1)
 
     print(f"Markdown file created at: {outpath}")
 
     return 0
 
 
+# Optional technique fields that can be hidden via technique_fields in the extension config
+TECHNIQUE_DISPLAY_FIELDS = ('id', 'name', 'description', 'synonyms', 'details', 'subtechniques', 'examples',
+                            'CASE_output_classes', 'weaknesses', 'references')
+
+# Weakness category fields and their display names, in display order.
+# Note: The fields in the dict use underscores (INAC_EX) due to Pydantic field names,
+# but we display them with hyphens (INAC-EX) for consistency with the JSON files
+WEAKNESS_CATEGORY_FIELDS = (
+    ('INCOMP', 'INCOMP'),
+    ('INAC_EX', 'INAC-EX'),
+    ('INAC_AS', 'INAC-AS'),
+    ('INAC_ALT', 'INAC-ALT'),
+    ('INAC_COR', 'INAC-COR'),
+    ('MISINT', 'MISINT'),
+)
+
+# Spaces become hyphens and commas, full stops, underscores and apostrophes are dropped
+FRIENDLY_ID_TRANSLATION = str.maketrans({' ': '-', ',': None, '.': None, '_': None, "'": None})
+
+
 def objective_name_to_friendly_id(name):
-    name = re.sub(' ', '-', name)
-    name = re.sub(',._\'', '', name)
-    name = name.lower().strip()
-    return name
+    return name.translate(FRIENDLY_ID_TRANSLATION).lower().strip()
 
 
 def get_weakness_categories(weakness):
@@ -81,296 +99,329 @@ def get_weakness_categories(weakness):
     Returns:
         A formatted string like "INCOMP, MISINT" or empty string if no categories are marked
     """
-    # Note: The fields in the dict use underscores (INAC_EX) due to Pydantic field names,
-    # but we display them with hyphens (INAC-EX) for consistency with the JSON files
-    category_field_mapping = {
-        'INCOMP': 'INCOMP',
-        'INAC_EX': 'INAC-EX',
-        'INAC_AS': 'INAC-AS',
-        'INAC_ALT': 'INAC-ALT',
-        'INAC_COR': 'INAC-COR',
-        'MISINT': 'MISINT'
-    }
-    marked_categories = []
-
-    for field_name, display_name in category_field_mapping.items():
-        value = weakness.get(field_name, '')
-        if value and value.lower() == 'x':
-            marked_categories.append(display_name)
-
-    if marked_categories:
-        return f"{', '.join(marked_categories)}"
-    return ""
+    return ", ".join(display_name for field_name, display_name in WEAKNESS_CATEGORY_FIELDS
+                     if (weakness.get(field_name) or '').lower() == 'x')
+
+
+def get_mitigation_list_markdown(kb, weakness_id, weakness, indent=""):
+    """
+    Returns the markdown bullet list of mitigations for a weakness.
+
+    Args:
+        kb: The knowledge base
+        weakness_id: ID of the weakness, used in error messages
+        weakness: The weakness dictionary
+        indent: Prefix added to each bullet line (e.g. to nest the list under a weakness)
+
+    Returns:
+        The bullet list as a single string, one line per mitigation
+    """
+    lines = []
+    for each_mit in weakness.get('mitigations'):
+        mitigation = kb.get_mitigation(each_mit)
+        if mitigation is None:
+            raise SOLVEITDataError(f'Mitigation {each_mit} not found (referred to from weakness {weakness_id})')
+
+        solveitx_mitigation_content_prefix = kb.add_markdown_to_mitigation_preview_prefix(each_mit)
+        solveitx_mitigation_content_suffix = kb.add_markdown_to_mitigation_preview_suffix(each_mit)
+
+        # Link to mitigation page, and also show related technique if present
+        if mitigation.get('technique') is None:
+            lines.append(f"{indent}- {solveitx_mitigation_content_prefix}[{each_mit}: {mitigation.get('name')}]({each_mit}.md){solveitx_mitigation_content_suffix}\n")
+        else:
+            lines.append(f"{indent}- {solveitx_mitigation_content_prefix}[{each_mit}: {mitigation.get('name')}]({each_mit}.md) (links to: [{mitigation.get('technique')}]({mitigation.get('technique')}.md)){solveitx_mitigation_content_suffix}\n")
+    return "".join(lines)
+
+
+def write_markdown_file(path, content):
+    """
+    Writes a complete markdown page to path.
+
+    The page is encoded once and written as bytes in a single call, skipping the
+    text layer's per-write encoding. Newlines are not translated, so the output is
+    the same on every platform.
+    """
+    with open(path, 'wb') as outfile:
+        outfile.write(content.encode('utf-8'))
 
 
 def create_main_markdown(kb, outpath):
     """Create the markdown file."""
 
-    with open(outpath, 'w', encoding='utf-8') as mdfile:
-        # Write the header
-        mdfile.write("# SOLVE-IT Knowledge Base\n\n")
-        mdfile.write("This is a generated markdown version of the SOLVE-IT knowledge base. See [GitHub repository](https://github.com/SOLVE-IT-DF/solve-it) for more details.\n\n")
+    mdfile = io.StringIO()
+    # Write the header
+    mdfile.write("# SOLVE-IT Knowledge Base\n\n")
+    mdfile.write("This is a generated markdown version of the SOLVE-IT knowledge base. See [GitHub repository](https://github.com/SOLVE-IT-DF/solve-it) for more details.\n\n")
+
+    # Add any prefix from extensions
+    mdfile.write(kb.add_markdown_to_main_page())
+    mdfile.write("\n\n")
+    
+
+    # Fetch the objectives and their anchors once for both the index and the body
+    objectives = kb.list_objectives()
+    friendly_ids = [objective_name_to_friendly_id(objective.get('name')) for objective in objectives]
 
-        # Add any prefix from extensions
-        mdfile.write(kb.add_markdown_to_main_page())
-        mdfile.write("\n\n")
-        
+    # Write table of contents
+    mdfile.write(f"# Objective Index\n" )
+    for objective, friendly_id in zip(objectives, friendly_ids):
+        mdfile.write(f"- [{objective.get('name')}](#{friendly_id})\n" )
+    mdfile.write(f"\n" )
 
-        # Write table of contents
-        mdfile.write(f"# Objective Index\n" )
-        for objective in kb.list_objectives():
-            mdfile.write(f"- [{objective.get('name')}](#{objective_name_to_friendly_id(objective.get('name'))})\n" )
-        mdfile.write(f"\n" )
+    mdfile.write(f"# Objectives and Techniques\n" )
 
-        mdfile.write(f"# Objectives and Techniques\n" )
+    # Techniques can be listed under several objectives and as subtechniques, so
+    # get each one's prefix and suffixes once
+    technique_ids = kb.list_techniques()
+    technique_prefixes = {t_id: kb.get_technique_prefix(t_id) for t_id in technique_ids}
+    technique_suffixes = {t_id: kb.get_technique_suffix(t_id) for t_id in technique_ids}
+    technique_preview_suffixes = {t_id: kb.add_markdown_to_technique_preview_suffix(t_id) for t_id in technique_ids}
 
-        # Write each objective and its techniques
-        for objective in kb.list_objectives():
-            mdfile.write(f'<a id="{objective_name_to_friendly_id(objective.get('name'))}"></a>\n')
-            mdfile.write(f"### {objective.get('name')}\n" )
-            mdfile.write(f"*{objective.get('description')}*\n\n")
+    # Write each objective and its techniques
+    for objective, friendly_id in zip(objectives, friendly_ids):
+        mdfile.write(f'<a id="{friendly_id}"></a>\n')
+        mdfile.write(f"### {objective.get('name')}\n" )
+        mdfile.write(f"*{objective.get('description')}*\n\n")
 
-            for each_technique_id in sorted(objective.get('techniques')):
-                technique = kb.get_technique(each_technique_id)
-                if technique is None:
-                    logging.error(f"Technique {each_technique_id} not found in knowledge base, exiting")
-                    sys.exit(-1)
+        for each_technique_id in sorted(objective.get('techniques')):
+            technique = kb.get_technique(each_technique_id)
+            if technique is None:
+                raise SOLVEITDataError(f"Technique {each_technique_id} not found in knowledge base")
 
-                solveitx_technique_content_suffix = kb.add_markdown_to_technique_preview_suffix(each_technique_id)
+            solveitx_technique_content_suffix = technique_preview_suffixes[each_technique_id]
 
-                mdfile.write(f"- {kb.get_technique_prefix(each_technique_id)}[{each_technique_id} - {technique.get('name')}](md_content/{each_technique_id}.md){kb.get_technique_suffix(each_technique_id)}{solveitx_technique_content_suffix}\n" )
-                for each_sub_technique_id in technique.get('subtechniques'):
-                    sub_t = kb.get_technique(each_sub_technique_id)
-                    if sub_t is None:
-                        logging.error(f'Subtechnique {each_sub_technique_id} not found (referred to from {each_technique_id})')
-                        sys.exit(-1)
+            mdfile.write(f"- {technique_prefixes[each_technique_id]}[{each_technique_id} - {technique.get('name')}](md_content/{each_technique_id}.md){technique_suffixes[each_technique_id]}{solveitx_technique_content_suffix}\n" )
+            for each_sub_technique_id in technique.get('subtechniques'):
+                sub_t = kb.get_technique(each_sub_technique_id)
+                if sub_t is None:
+                    raise SOLVEITDataError(f'Subtechnique {each_sub_technique_id} not found (referred to from {each_technique_id})')
 
-                    mdfile.write(f"    - {kb.get_technique_prefix(each_sub_technique_id)}[{each_sub_technique_id} - {sub_t.get('name')}](md_content/{each_sub_technique_id}.md){kb.get_technique_suffix(each_sub_technique_id)}\n" )
+                mdfile.write(f"    - {technique_prefixes[each_sub_technique_id]}[{each_sub_technique_id} - {sub_t.get('name')}](md_content/{each_sub_technique_id}.md){technique_suffixes[each_sub_technique_id]}\n" )
+
+    # Write footer with generation timestamp
+    generation_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    mdfile.write(f"\n\n---\n\n")
+    mdfile.write(f"*Markdown generated: {generation_time}*\n")
 
-        # Write footer with generation timestamp
-        generation_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        mdfile.write(f"\n\n---\n\n")
-        mdfile.write(f"*Markdown generated: {generation_time}*\n")
+    write_markdown_file(outpath, mdfile.getvalue())
 
 
 def write_all_technique_files(kb, outpath):
     generation_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    for each_technique_id in kb.list_techniques():
-        technique = kb.get_technique(each_technique_id)
-        if technique is None:
-            logging.error(f"Technique {each_technique_id} not found in knowledge base, exiting")
-            sys.exit(-1)
-        technique_filepath = os.path.join(os.path.dirname(outpath), 'md_content', each_technique_id + '.md')
-        with open(technique_filepath, 'w', encoding='utf-8') as technique_md_file:
-            technique_md_file.write(f"[< back to main](../solve-it.md)\n")
-            technique_md_file.write(f"# {each_technique_id}\n\n")
-
-            if kb.should_display_field('id'):
-                technique_md_file.write(f"**ID:** {technique.get('id')}\n\n")
-            if kb.should_display_field('name'):
-                technique_md_file.write(f"**Name:** {technique.get('name')}\n\n")
-
-            # Display objectives/categories (including parent's objectives for subtechniques)
-            objectives = kb.get_objectives_for_technique(each_technique_id)
-            if objectives:
-                technique_md_file.write(f"**Objective(s):** {', '.join(objectives)}\n\n")
-
-            if kb.should_display_field('description'):
-                technique_md_file.write(f"**Description:**\n\n")
-                technique_md_file.write(f"{technique.get('description')}\n\n")
-
-            if kb.should_display_field('synonyms'):
-                technique_md_file.write(f"**Synonyms:**\n\n")
-                for each_synonym in technique.get('synonyms'):
-                    technique_md_file.write(f"{each_synonym}, ")
-                technique_md_file.write("\n\n")
-
-            if kb.should_display_field('details'):
-                technique_md_file.write(f"**Details:**\n\n")
-                technique_md_file.write(f"{technique.get('details')}\n\n")
-
-            if kb.should_display_field('subtechniques'):
-                technique_md_file.write(f"**Subtechniques:**\n\n")
-                for each_sub_technique_id in technique.get('subtechniques'):
-                    sub_t = kb.get_technique(each_sub_technique_id)
-                    if sub_t is None:
-                        logging.error(f'Subtechnique {each_sub_technique_id} not found (referred to from {each_technique_id})')
-                        sys.exit(-1)
-
-                    technique_md_file.write(f"- [{each_sub_technique_id} - {sub_t.get('name')}]({each_sub_technique_id}.md)\n")
-                technique_md_file.write(f"\n\n")
-
-            if kb.should_display_field('examples'):
-                technique_md_file.write(f"**Examples:**\n\n")
-                for each_example in technique.get('examples'):
-                    technique_md_file.write(f"- {each_example}\n")
-                technique_md_file.write(f"\n\n")
-
-            if kb.should_display_field('CASE_output_classes'):
-                technique_md_file.write(f"**Output Classes:**\n\n")
-                for each_case_class in technique.get('CASE_output_classes'):
-                    technique_md_file.write(f"- [{each_case_class}]({each_case_class})\n")
-                technique_md_file.write(f"\n\n")
-
-            if kb.should_display_field('weaknesses'):
-                technique_md_file.write(f"**Potential weaknesses and potential mitigations:**\n\n")
-                for weakness_id in technique.get('weaknesses'):
-                    weakness = kb.get_weakness(weakness_id)
-                    if weakness is None:
-                        logging.error(f"Weakness {weakness_id} not found (referred to from {each_technique_id})")
-                        sys.exit(-1)
-
-                    categories_str = get_weakness_categories(weakness)
-
-                    solveitx_weakness_content_prefix = kb.add_markdown_to_weakness_preview_prefix(weakness_id)
-                    solveitx_weakness_content_suffix = kb.add_markdown_to_weakness_preview_suffix(weakness_id)
-
-                    technique_md_file.write(f"- {solveitx_weakness_content_prefix}[{weakness_id}: {weakness.get('name')}]({weakness_id}.md) _({categories_str})_{solveitx_weakness_content_suffix}\n")
-
-                    # This adds all the mitigations
-                    for each_mit in weakness.get('mitigations'):
-                        mitigation = kb.get_mitigation(each_mit)
-                        if mitigation is None:
-                            logging.error(f'Mitigation {each_mit} not found (referred to from weakness {weakness_id})')
-                            sys.exit(-1)
-
-                        solveitx_mitigation_content_prefix = kb.add_markdown_to_mitigation_preview_prefix(each_mit)
-                        solveitx_mitigation_content_suffix = kb.add_markdown_to_mitigation_preview_suffix(each_mit)
-
-                        # Link to mitigation page, and also show related technique if present
-                        if mitigation.get('technique') is None:
-                            technique_md_file.write(f"    - {solveitx_mitigation_content_prefix}[{each_mit}: {mitigation.get('name')}]({each_mit}.md){solveitx_mitigation_content_suffix}\n")
-                        else:
-                            technique_md_file.write(f"    - {solveitx_mitigation_content_prefix}[{each_mit}: {mitigation.get('name')}]({each_mit}.md) (links to: [{mitigation.get('technique')}]({mitigation.get('technique')}.md)){solveitx_mitigation_content_suffix}\n")
-                technique_md_file.write(f"\n\n")
-
-            if kb.should_display_field('references'):
-                technique_md_file.write(f"**References:**\n\n")
-                for each_reference in technique.get('references'):
-                    technique_md_file.write(f"- {each_reference}\n")
-                technique_md_file.write(f"\n\n")
-
-            # Add content from SOLVE-IT Extensions
-            technique_md_file.write(f"{kb.add_markdown_to_technique(each_technique_id)}")
-
-            # Write footer with generation timestamp
-            technique_md_file.write(f"\n\n---\n\n")
-            technique_md_file.write(f"*Markdown generated: {generation_time}*\n")
+    md_content_dir = os.path.join(os.path.dirname(outpath), 'md_content')
+
+    # Field visibility is fixed for the run, so look it up once rather than per technique
+    display_fields = {field: kb.should_display_field(field) for field in TECHNIQUE_DISPLAY_FIELDS}
+
+    # A weakness's entry (its line, extension prefix/suffix and mitigation sub-list) is
+    # the same on every technique page that lists the weakness, so render each one once up front
+    weakness_entries_md = {}
+    for weakness_id in kb.list_weaknesses():
+        weakness = kb.get_weakness(weakness_id)
+
+        categories_str = get_weakness_categories(weakness)
+
+        solveitx_weakness_content_prefix = kb.add_markdown_to_weakness_preview_prefix(weakness_id)
+        solveitx_weakness_content_suffix = kb.add_markdown_to_weakness_preview_suffix(weakness_id)
+
+        weakness_entries_md[weakness_id] = (f"- {solveitx_weakness_content_prefix}[{weakness_id}: {weakness.get('name')}]({weakness_id}.md) _({categories_str})_{solveitx_weakness_content_suffix}\n"
+                                            + get_mitigation_list_markdown(kb, weakness_id, weakness, indent="    "))
+
+    # Each technique page is independent of the others, so they are rendered concurrently
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(lambda technique_id: write_technique_file(kb, technique_id, md_content_dir, generation_time,
+                                                                    display_fields, weakness_entries_md),
+                          kb.list_techniques()))
+
+
+def write_technique_file(kb, each_technique_id, md_content_dir, generation_time, display_fields, weakness_entries_md):
+    """Write the markdown page for a single technique."""
+    technique = kb.get_technique(each_technique_id)
+    if technique is None:
+        raise SOLVEITDataError(f"Technique {each_technique_id} not found in knowledge base")
+    technique_filepath = os.path.join(md_content_dir, each_technique_id + '.md')
+    technique_md_file = io.StringIO()
+    technique_md_file.write(f"[< back to main](../solve-it.md)\n")
+    technique_md_file.write(f"# {each_technique_id}\n\n")
+
+    if display_fields['id']:
+        technique_md_file.write(f"**ID:** {technique.get('id')}\n\n")
+    if display_fields['name']:
+        technique_md_file.write(f"**Name:** {technique.get('name')}\n\n")
+
+    # Display objectives/categories (including parent's objectives for subtechniques)
+    objectives = kb.get_objectives_for_technique(each_technique_id)
+    if objectives:
+        technique_md_file.write(f"**Objective(s):** {', '.join(objectives)}\n\n")
+
+    if display_fields['description']:
+        technique_md_file.write(f"**Description:**\n\n")
+        technique_md_file.write(f"{technique.get('description')}\n\n")
+
+    # List sections are only written when there is something to list
+    if display_fields['synonyms'] and technique.get('synonyms'):
+        technique_md_file.write(f"**Synonyms:**\n\n")
+        technique_md_file.write(", ".join(technique.get('synonyms')))
+        technique_md_file.write("\n\n")
+
+    if display_fields['details']:
+        technique_md_file.write(f"**Details:**\n\n")
+        technique_md_file.write(f"{technique.get('details')}\n\n")
+
+    if display_fields['subtechniques'] and technique.get('subtechniques'):
+        technique_md_file.write(f"**Subtechniques:**\n\n")
+        for each_sub_technique_id in technique.get('subtechniques'):
+            sub_t = kb.get_technique(each_sub_technique_id)
+            if sub_t is None:
+                raise SOLVEITDataError(f'Subtechnique {each_sub_technique_id} not found (referred to from {each_technique_id})')
+
+            technique_md_file.write(f"- [{each_sub_technique_id} - {sub_t.get('name')}]({each_sub_technique_id}.md)\n")
+        technique_md_file.write(f"\n\n")
+
+    if display_fields['examples'] and technique.get('examples'):
+        technique_md_file.write(f"**Examples:**\n\n")
+        technique_md_file.write("".join(f"- {each_example}\n" for each_example in technique.get('examples')))
+        technique_md_file.write(f"\n\n")
+
+    if display_fields['CASE_output_classes'] and technique.get('CASE_output_classes'):
+        technique_md_file.write(f"**Output Classes:**\n\n")
+        technique_md_file.write("".join(f"- [{each_case_class}]({each_case_class})\n" for each_case_class in technique.get('CASE_output_classes')))
+        technique_md_file.write(f"\n\n")
+
+    if display_fields['weaknesses']:
+        technique_md_file.write(f"**Potential weaknesses and potential mitigations:**\n\n")
+        for weakness_id in technique.get('weaknesses'):
+            weakness_entry_md = weakness_entries_md.get(weakness_id)
+            if weakness_entry_md is None:
+                raise SOLVEITDataError(f"Weakness {weakness_id} not found (referred to from {each_technique_id})")
+
+            # Weakness line followed by all its mitigations
+            technique_md_file.write(weakness_entry_md)
+        technique_md_file.write(f"\n\n")
+
+    if display_fields['references'] and technique.get('references'):
+        technique_md_file.write(f"**References:**\n\n")
+        technique_md_file.write("".join(f"- {each_reference}\n" for each_reference in technique.get('references')))
+        technique_md_file.write(f"\n\n")
+
+    # Add content from SOLVE-IT Extensions
+    technique_md_file.write(f"{kb.add_markdown_to_technique(each_technique_id)}")
+
+    # Write footer with generation timestamp
+    technique_md_file.write(f"\n\n---\n\n")
+    technique_md_file.write(f"*Markdown generated: {generation_time}*\n")
+
+    write_markdown_file(technique_filepath, technique_md_file.getvalue())
       
 
 def write_all_weakness_files(kb, outpath):
     generation_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    for each_weakness_id in kb.list_weaknesses():
-        weakness = kb.get_weakness(each_weakness_id)
-        if weakness is None:
-            logging.error(f"Weakness {each_weakness_id} not found in knowledge base, exiting")
-            sys.exit(-1)
-        weakness_filepath = os.path.join(os.path.dirname(outpath), 'md_content', each_weakness_id + '.md')
-        with open(weakness_filepath, 'w', encoding='utf-8') as weakness_md_file:
-            weakness_md_file.write(f"[< back to main](../solve-it.md)\n")
-            weakness_md_file.write(f"# {each_weakness_id}\n\n")
-            weakness_md_file.write(f"**Name:** {weakness.get('name')}\n\n")
-            weakness_md_file.write(f"**Weakness classes:** {get_weakness_categories(weakness)}\n\n")
-            weakness_md_file.write(f"**Details:** {weakness.get('details')}\n\n")
-
-            # Find and list techniques that reference this weakness
-            techniques_with_weakness = []
-            for technique_id in kb.list_techniques():
-                technique = kb.get_technique(technique_id)
-                if each_weakness_id in technique.get('weaknesses', []):
-                    techniques_with_weakness.append(technique_id)
-
-            if techniques_with_weakness:
-                weakness_md_file.write(f"**Present in techniques:**\n\n")
-                for technique_id in techniques_with_weakness:
-                    technique = kb.get_technique(technique_id)
-                    weakness_md_file.write(f"- [{technique_id}: {technique.get('name')}]({technique_id}.md)\n")
-                weakness_md_file.write(f"\n\n")
-
-            # This adds all the mitigations
-            weakness_md_file.write(f"**Potential mitigations:**\n\n")
-            for each_mit in weakness.get('mitigations'):
-                mitigation = kb.get_mitigation(each_mit)
-                if mitigation is None:
-                    logging.error(f'Mitigation {each_mit} not found (referred to from weakness {each_weakness_id})')
-                    sys.exit(-1)
-
-                solveitx_mitigation_content_prefix = kb.add_markdown_to_mitigation_preview_prefix(each_mit)
-                solveitx_mitigation_content_suffix = kb.add_markdown_to_mitigation_preview_suffix(each_mit)
-
-                # Link to mitigation page, and also show related technique if present
-                if mitigation.get('technique') is None:
-                    weakness_md_file.write(f"- {solveitx_mitigation_content_prefix}[{each_mit}: {mitigation.get('name')}]({each_mit}.md){solveitx_mitigation_content_suffix}\n")
-                else:
-                    weakness_md_file.write(f"- {solveitx_mitigation_content_prefix}[{each_mit}: {mitigation.get('name')}]({each_mit}.md) (links to: [{mitigation.get('technique')}]({mitigation.get('technique')}.md)){solveitx_mitigation_content_suffix}\n")
-            weakness_md_file.write(f"\n\n") 
-
-            # This adds all the references
-            weakness_md_file.write(f"**References:**\n\n")
-            for each_reference in weakness.get('references'):
-                weakness_md_file.write(f"- {each_reference}\n")
-            weakness_md_file.write(f"\n\n")
-
-            # Add content from SOLVE-IT Extensions
-            weakness_md_file.write(f"{kb.add_markdown_to_weakness(each_weakness_id)}")
-
-            # Write footer with generation timestamp
-            weakness_md_file.write(f"\n\n---\n\n")
-            weakness_md_file.write(f"*Markdown generated: {generation_time}*\n")
+    md_content_dir = os.path.join(os.path.dirname(outpath), 'md_content')
+
+    # Each weakness page is independent of the others, so they are rendered concurrently
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(lambda weakness_id: write_weakness_file(kb, weakness_id, md_content_dir, generation_time),
+                          kb.list_weaknesses()))
+
+
+def write_weakness_file(kb, each_weakness_id, md_content_dir, generation_time):
+    """Write the markdown page for a single weakness."""
+    weakness = kb.get_weakness(each_weakness_id)
+    if weakness is None:
+        raise SOLVEITDataError(f"Weakness {each_weakness_id} not found in knowledge base")
+    weakness_filepath = os.path.join(md_content_dir, each_weakness_id + '.md')
+    weakness_md_file = io.StringIO()
+    weakness_md_file.write(f"[< back to main](../solve-it.md)\n")
+    weakness_md_file.write(f"# {each_weakness_id}\n\n")
+    weakness_md_file.write(f"**Name:** {weakness.get('name')}\n\n")
+    weakness_md_file.write(f"**Weakness classes:** {get_weakness_categories(weakness)}\n\n")
+    weakness_md_file.write(f"**Details:** {weakness.get('details')}\n\n")
+
+    # List techniques that reference this weakness (from the kb's reverse index)
+    techniques_with_weakness = kb.get_techniques_for_weakness(each_weakness_id)
+
+    if techniques_with_weakness:
+        weakness_md_file.write(f"**Present in techniques:**\n\n")
+        for technique in techniques_with_weakness:
+            technique_id = technique.get('id')
+            weakness_md_file.write(f"- [{technique_id}: {technique.get('name')}]({technique_id}.md)\n")
+        weakness_md_file.write(f"\n\n")
+
+    # This adds all the mitigations
+    weakness_md_file.write(f"**Potential mitigations:**\n\n")
+    weakness_md_file.write(get_mitigation_list_markdown(kb, each_weakness_id, weakness))
+    weakness_md_file.write(f"\n\n") 
+
+    # This adds all the references, if there are any
+    if weakness.get('references'):
+        weakness_md_file.write(f"**References:**\n\n")
+        weakness_md_file.write("".join(f"- {each_reference}\n" for each_reference in weakness.get('references')))
+        weakness_md_file.write(f"\n\n")
+
+    # Add content from SOLVE-IT Extensions
+    weakness_md_file.write(f"{kb.add_markdown_to_weakness(each_weakness_id)}")
+
+    # Write footer with generation timestamp
+    weakness_md_file.write(f"\n\n---\n\n")
+    weakness_md_file.write(f"*Markdown generated: {generation_time}*\n")
+
+    write_markdown_file(weakness_filepath, weakness_md_file.getvalue())
 
 
 def write_all_mitigation_files(kb, outpath):
     generation_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    for each_mitigation_id in kb.list_mitigations():
-        mitigation = kb.get_mitigation(each_mitigation_id)
-        if mitigation is None:
-            logging.error(f"Mitigation {each_mitigation_id} not found in knowledge base, exiting")
-            sys.exit(-1)
-        mitigation_filepath = os.path.join(os.path.dirname(outpath), 'md_content', each_mitigation_id + '.md')
-        with open(mitigation_filepath, 'w', encoding='utf-8') as mitigation_md_file:
-            mitigation_md_file.write(f"[< back to main](../solve-it.md)\n")
-            mitigation_md_file.write(f"# {each_mitigation_id}\n\n")
-            mitigation_md_file.write(f"**Name:** {mitigation.get('name')}\n\n")
-            mitigation_md_file.write(f"**Details:** {mitigation.get('details')}\n\n")
-
-            # Add technique reference if present
-            if mitigation.get('technique'):
-                linked_technique = kb.get_technique(mitigation.get('technique'))
-                if linked_technique:
-                    mitigation_md_file.write(f"**Linked technique:** [{mitigation.get('technique')}: {linked_technique.get('name')}]({mitigation.get('technique')}.md)\n\n")
-                else:
-                    mitigation_md_file.write(f"**Linked technique:** [{mitigation.get('technique')}]({mitigation.get('technique')}.md)\n\n")
-
-            # Find and list weaknesses that reference this mitigation
-            weaknesses_using_mitigation = []
-            for weakness_id in kb.list_weaknesses():
-                weakness = kb.get_weakness(weakness_id)
-                if each_mitigation_id in weakness.get('mitigations', []):
-                    weaknesses_using_mitigation.append(weakness_id)
-
-            if weaknesses_using_mitigation:
-                mitigation_md_file.write(f"**Potentially mitigates:**\n\n")
-                for weakness_id in weaknesses_using_mitigation:
-                    weakness = kb.get_weakness(weakness_id)
-                    mitigation_md_file.write(f"- [{weakness_id}: {weakness.get('name')}]({weakness_id}.md)\n")
-                mitigation_md_file.write(f"\n\n")
-
-            # Add references if present
-            if mitigation.get('references'):
-                mitigation_md_file.write(f"**References:**\n\n")
-                for each_reference in mitigation.get('references'):
-                    mitigation_md_file.write(f"- {each_reference}\n")
-                mitigation_md_file.write(f"\n\n")
-
-            # Add content from SOLVE-IT Extensions
-            mitigation_md_file.write(f"{kb.add_markdown_to_mitigation(each_mitigation_id)}")
-
-            # Write footer with generation timestamp
-            mitigation_md_file.write(f"\n\n---\n\n")
-            mitigation_md_file.write(f"*Markdown generated: {generation_time}*\n")
+    md_content_dir = os.path.join(os.path.dirname(outpath), 'md_content')
+
+    # Each mitigation page is independent of the others, so they are rendered concurrently
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(lambda mitigation_id: write_mitigation_file(kb, mitigation_id, md_content_dir, generation_time),
+                          kb.list_mitigations()))
+
+
+def write_mitigation_file(kb, each_mitigation_id, md_content_dir, generation_time):
+    """Write the markdown page for a single mitigation."""
+    mitigation = kb.get_mitigation(each_mitigation_id)
+    if mitigation is None:
+        raise SOLVEITDataError(f"Mitigation {each_mitigation_id} not found in knowledge base")
+    mitigation_filepath = os.path.join(md_content_dir, each_mitigation_id + '.md')
+    mitigation_md_file = io.StringIO()
+    mitigation_md_file.write(f"[< back to main](../solve-it.md)\n")
+    mitigation_md_file.write(f"# {each_mitigation_id}\n\n")
+    mitigation_md_file.write(f"**Name:** {mitigation.get('name')}\n\n")
+    mitigation_md_file.write(f"**Details:** {mitigation.get('details')}\n\n")
+
+    # Add technique reference if present
+    if mitigation.get('technique'):
+        linked_technique = kb.get_technique(mitigation.get('technique'))
+        if linked_technique:
+            mitigation_md_file.write(f"**Linked technique:** [{mitigation.get('technique')}: {linked_technique.get('name')}]({mitigation.get('technique')}.md)\n\n")
+        else:
+            mitigation_md_file.write(f"**Linked technique:** [{mitigation.get('technique')}]({mitigation.get('technique')}.md)\n\n")
+
+    # List weaknesses that reference this mitigation (from the kb's reverse index)
+    weaknesses_using_mitigation = kb.get_weaknesses_for_mitigation(each_mitigation_id)
+
+    if weaknesses_using_mitigation:
+        mitigation_md_file.write(f"**Potentially mitigates:**\n\n")
+        for weakness in weaknesses_using_mitigation:
+            weakness_id = weakness.get('id')
+            mitigation_md_file.write(f"- [{weakness_id}: {weakness.get('name')}]({weakness_id}.md)\n")
+        mitigation_md_file.write(f"\n\n")
+
+    # Add references if present
+    if mitigation.get('references'):
+        mitigation_md_file.write(f"**References:**\n\n")
+        mitigation_md_file.write("".join(f"- {each_reference}\n" for each_reference in mitigation.get('references')))
+        mitigation_md_file.write(f"\n\n")
+
+    # Add content from SOLVE-IT Extensions
+    mitigation_md_file.write(f"{kb.add_markdown_to_mitigation(each_mitigation_id)}")
+
+    # Write footer with generation timestamp
+    mitigation_md_file.write(f"\n\n---\n\n")
+    mitigation_md_file.write(f"*Markdown generated: {generation_time}*\n")
+
+    write_markdown_file(mitigation_filepath, mitigation_md_file.getvalue())
 
 
 if __name__ == "__main__":
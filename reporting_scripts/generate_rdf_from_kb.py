@@ -22,6 +22,7 @@ import argparse
 import sys
 import os
 import logging
+from functools import lru_cache
 from pathlib import Path
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -46,6 +47,47 @@ UCO_CORE = Namespace("https://ontology.unifiedcyberontology.org/uco/core/")
 UCO_OBSERVABLE = Namespace("https://ontology.unifiedcyberontology.org/uco/observable/")
 CASE_INVESTIGATION = Namespace("https://ontology.caseontology.org/case/investigation/")
 
+# Boolean literals shared by every weakness category flag
+LITERAL_TRUE = Literal(True, datatype=XSD.boolean)
+LITERAL_FALSE = Literal(False, datatype=XSD.boolean)
+
+# Weakness category fields and the predicates they map to, in output order
+WEAKNESS_CATEGORY_PREDICATES = (
+    ('INCOMP', SOLVEIT_CORE.mayResultInINCOMP),
+    ('INAC_EX', SOLVEIT_CORE.mayResultInINAC_EX),
+    ('INAC_AS', SOLVEIT_CORE.mayResultInINAC_AS),
+    ('INAC_ALT', SOLVEIT_CORE.mayResultInINAC_ALT),
+    ('INAC_COR', SOLVEIT_CORE.mayResultInINAC_COR),
+    ('MISINT', SOLVEIT_CORE.mayResultInMISINT),
+)
+
+
+# Entity URIs are used both as subjects and as the targets of cross-references,
+# so each one is built once and reused
+@lru_cache(maxsize=None)
+def technique_uri(tech_id):
+    """Return the URI for a technique in the data namespace."""
+    return SOLVEIT_DATA[f"technique{tech_id}"]
+
+
+@lru_cache(maxsize=None)
+def weakness_uri(weak_id):
+    """Return the URI for a weakness in the data namespace."""
+    return SOLVEIT_DATA[f"weakness{weak_id}"]
+
+
+@lru_cache(maxsize=None)
+def mitigation_uri(mit_id):
+    """Return the URI for a mitigation in the data namespace."""
+    return SOLVEIT_DATA[f"mitigation{mit_id}"]
+
+
+# The same CASE output classes are listed by many techniques
+@lru_cache(maxsize=None)
+def case_class_literal(case_class_uri):
+    """Return the xsd:anyURI typed literal for a CASE output class URI."""
+    return Literal(case_class_uri, datatype=XSD.anyURI)
+
 
 def create_rdf_graph(kb, include_objectives=True):
     """
@@ -99,148 +141,147 @@ def create_rdf_graph(kb, include_objectives=True):
 def add_techniques_to_graph(g, kb):
     """Add all techniques to the RDF graph."""
     techniques = kb.list_techniques()
+    # Triples are collected and added to the graph in one batch at the end
+    triples = []
 
     for tech_id in techniques:
         tech = kb.get_technique(tech_id)
 
         # Create URI for this technique (instance in data namespace)
-        tech_uri = SOLVEIT_DATA[f"technique{tech_id}"]
+        tech_uri = technique_uri(tech_id)
 
         # Add type
-        g.add((tech_uri, RDF.type, SOLVEIT_CORE.Technique))
+        triples.append((tech_uri, RDF.type, SOLVEIT_CORE.Technique))
 
         # Add label
-        g.add((tech_uri, RDFS.label, Literal(f"{tech_id}: {tech['name']}", lang="en")))
+        triples.append((tech_uri, RDFS.label, Literal(f"{tech_id}: {tech['name']}", lang="en")))
 
         # Add basic properties
-        g.add((tech_uri, SOLVEIT_CORE.techniqueID, Literal(tech_id)))
-        g.add((tech_uri, SOLVEIT_CORE.techniqueName, Literal(tech['name'])))
+        triples.append((tech_uri, SOLVEIT_CORE.techniqueID, Literal(tech_id)))
+        triples.append((tech_uri, SOLVEIT_CORE.techniqueName, Literal(tech['name'])))
 
         if tech.get('description'):
-            g.add((tech_uri, SOLVEIT_CORE.techniqueDescription, Literal(tech['description'])))
+            triples.append((tech_uri, SOLVEIT_CORE.techniqueDescription, Literal(tech['description'])))
 
         if tech.get('details'):
-            g.add((tech_uri, SOLVEIT_CORE.techniqueDetails, Literal(tech['details'])))
+            triples.append((tech_uri, SOLVEIT_CORE.techniqueDetails, Literal(tech['details'])))
 
         # Add synonyms
         for synonym in tech.get('synonyms', []):
-            g.add((tech_uri, SOLVEIT_CORE.hasSynonym, Literal(synonym)))
+            triples.append((tech_uri, SOLVEIT_CORE.hasSynonym, Literal(synonym)))
 
         # Add examples
         for example in tech.get('examples', []):
-            g.add((tech_uri, SOLVEIT_CORE.hasExample, Literal(example)))
+            triples.append((tech_uri, SOLVEIT_CORE.hasExample, Literal(example)))
 
         # Add references
         for reference in tech.get('references', []):
-            g.add((tech_uri, SOLVEIT_CORE.hasReference, Literal(reference)))
+            triples.append((tech_uri, SOLVEIT_CORE.hasReference, Literal(reference)))
 
         # Add subtechnique relationships
         for sub_id in tech.get('subtechniques', []):
-            sub_uri = SOLVEIT_DATA[f"technique{sub_id}"]
-            g.add((tech_uri, SOLVEIT_CORE.hasSubtechnique, sub_uri))
+            sub_uri = technique_uri(sub_id)
+            triples.append((tech_uri, SOLVEIT_CORE.hasSubtechnique, sub_uri))
 
         # Add weakness relationships
         for weakness_id in tech.get('weaknesses', []):
-            weakness_uri = SOLVEIT_DATA[f"weakness{weakness_id}"]
-            g.add((tech_uri, SOLVEIT_CORE.hasPotentialWeakness, weakness_uri))
+            weak_uri = weakness_uri(weakness_id)
+            triples.append((tech_uri, SOLVEIT_CORE.hasPotentialWeakness, weak_uri))
 
         # Add CASE output classes (as xsd:anyURI typed literals)
         for case_class_uri in tech.get('CASE_output_classes', []):
             # CASE_output_classes are already full URIs in the JSON
-            g.add((tech_uri, SOLVEIT_CORE.hasCASEOutputClass, Literal(case_class_uri, datatype=XSD.anyURI)))
+            triples.append((tech_uri, SOLVEIT_CORE.hasCASEOutputClass, case_class_literal(case_class_uri)))
+
+    g.addN((subject, predicate, obj, g) for subject, predicate, obj in triples)
 
 
 def add_weaknesses_to_graph(g, kb):
     """Add all weaknesses to the RDF graph."""
     weaknesses = kb.list_weaknesses()
+    # Triples are collected and added to the graph in one batch at the end
+    triples = []
 
     for weak_id in weaknesses:
         weak = kb.get_weakness(weak_id)
 
         # Create URI for this weakness (instance in data namespace)
-        weak_uri = SOLVEIT_DATA[f"weakness{weak_id}"]
+        weak_uri = weakness_uri(weak_id)
 
         # Add type
-        g.add((weak_uri, RDF.type, SOLVEIT_CORE.Weakness))
+        triples.append((weak_uri, RDF.type, SOLVEIT_CORE.Weakness))
 
         # Add label
-        g.add((weak_uri, RDFS.label, Literal(f"{weak_id}: {weak['name']}", lang="en")))
+        triples.append((weak_uri, RDFS.label, Literal(f"{weak_id}: {weak['name']}", lang="en")))
 
         # Add basic properties
-        g.add((weak_uri, SOLVEIT_CORE.weaknessID, Literal(weak_id)))
-        g.add((weak_uri, SOLVEIT_CORE.weaknessName, Literal(weak['name'])))
+        triples.append((weak_uri, SOLVEIT_CORE.weaknessID, Literal(weak_id)))
+        triples.append((weak_uri, SOLVEIT_CORE.weaknessName, Literal(weak['name'])))
 
         # Add description if present
         if weak.get('description'):
-            g.add((weak_uri, SOLVEIT_CORE.weaknessDescription, Literal(weak['description'])))
+            triples.append((weak_uri, SOLVEIT_CORE.weaknessDescription, Literal(weak['description'])))
 
         # Add ALL error category flags explicitly (true or false)
         # This follows the pattern in the ontology examples
-        g.add((weak_uri, SOLVEIT_CORE.mayResultInINCOMP,
-               Literal(bool(weak.get('INCOMP')), datatype=XSD.boolean)))
-
-        g.add((weak_uri, SOLVEIT_CORE.mayResultInINAC_EX,
-               Literal(bool(weak.get('INAC_EX')), datatype=XSD.boolean)))
-
-        g.add((weak_uri, SOLVEIT_CORE.mayResultInINAC_AS,
-               Literal(bool(weak.get('INAC_AS')), datatype=XSD.boolean)))
-
-        g.add((weak_uri, SOLVEIT_CORE.mayResultInINAC_ALT,
-               Literal(bool(weak.get('INAC_ALT')), datatype=XSD.boolean)))
-
-        g.add((weak_uri, SOLVEIT_CORE.mayResultInINAC_COR,
-               Literal(bool(weak.get('INAC_COR')), datatype=XSD.boolean)))
-
-        g.add((weak_uri, SOLVEIT_CORE.mayResultInMISINT,
-               Literal(bool(weak.get('MISINT')), datatype=XSD.boolean)))
+        for field_name, predicate in WEAKNESS_CATEGORY_PREDICATES:
+            triples.append((weak_uri, predicate, LITERAL_TRUE if weak.get(field_name) else LITERAL_FALSE))
 
         # Add mitigation relationships
         for mitigation_id in weak.get('mitigations', []):
-            mitigation_uri = SOLVEIT_DATA[f"mitigation{mitigation_id}"]
-            g.add((weak_uri, SOLVEIT_CORE.hasPotentialMitigation, mitigation_uri))
+            mit_uri = mitigation_uri(mitigation_id)
+            triples.append((weak_uri, SOLVEIT_CORE.hasPotentialMitigation, mit_uri))
 
         # Add references
         for reference in weak.get('references', []):
-            g.add((weak_uri, SOLVEIT_CORE.hasReference, Literal(reference)))
+            triples.append((weak_uri, SOLVEIT_CORE.hasReference, Literal(reference)))
+
+    g.addN((subject, predicate, obj, g) for subject, predicate, obj in triples)
 
 
 def add_mitigations_to_graph(g, kb):
     """Add all mitigations to the RDF graph."""
     mitigations = kb.list_mitigations()
+    # Triples are collected and added to the graph in one batch at the end
+    triples = []
 
     for mit_id in mitigations:
         mit = kb.get_mitigation(mit_id)
 
         # Create URI for this mitigation (instance in data namespace)
-        mit_uri = SOLVEIT_DATA[f"mitigation{mit_id}"]
+        mit_uri = mitigation_uri(mit_id)
 
         # Add type
-        g.add((mit_uri, RDF.type, SOLVEIT_CORE.Mitigation))
+        triples.append((mit_uri, RDF.type, SOLVEIT_CORE.Mitigation))
 
         # Add label
-        g.add((mit_uri, RDFS.label, Literal(f"{mit_id}: {mit['name']}", lang="en")))
+        triples.append((mit_uri, RDFS.label, Literal(f"{mit_id}: {mit['name']}", lang="en")))
 
         # Add basic properties
-        g.add((mit_uri, SOLVEIT_CORE.mitigationID, Literal(mit_id)))
-        g.add((mit_uri, SOLVEIT_CORE.mitigationName, Literal(mit['name'])))
+        triples.append((mit_uri, SOLVEIT_CORE.mitigationID, Literal(mit_id)))
+        triples.append((mit_uri, SOLVEIT_CORE.mitigationName, Literal(mit['name'])))
 
         # Add description if present
         if mit.get('description'):
-            g.add((mit_uri, SOLVEIT_CORE.mitigationDescription, Literal(mit['description'])))
+            triples.append((mit_uri, SOLVEIT_CORE.mitigationDescription, Literal(mit['description'])))
 
         # Add technique link if present
         if mit.get('technique'):
-            technique_uri = SOLVEIT_DATA[f"technique{mit['technique']}"]
-            g.add((mit_uri, SOLVEIT_CORE.linksToTechnique, technique_uri))
+            linked_technique_uri = technique_uri(mit['technique'])
+            triples.append((mit_uri, SOLVEIT_CORE.linksToTechnique, linked_technique_uri))
 
         # Add references
         for reference in mit.get('references', []):
-            g.add((mit_uri, SOLVEIT_CORE.hasReference, Literal(reference)))
+            triples.append((mit_uri, SOLVEIT_CORE.hasReference, Literal(reference)))
+
+    g.addN((subject, predicate, obj, g) for subject, predicate, obj in triples)
 
 
 def add_objectives_to_graph(g, kb):
     """Add investigation objectives to the RDF graph."""
     objectives = kb.list_objectives()
+    # Triples are collected and added to the graph in one batch at the end
+    triples = []
 
     for idx, objective in enumerate(objectives, 1):
         obj_name = objective.get('name')
@@ -250,21 +291,27 @@ def add_objectives_to_graph(g, kb):
         obj_uri = SOLVEIT_DATA[f"objective{idx:02d}"]
 
         # Add type
-        g.add((obj_uri, RDF.type, SOLVEIT_CORE.Objective))
+        triples.append((obj_uri, RDF.type, SOLVEIT_CORE.Objective))
 
         # Add label
-        g.add((obj_uri, RDFS.label, Literal(obj_name, lang="en")))
+        triples.append((obj_uri, RDFS.label, Literal(obj_name, lang="en")))
 
         # Add properties
-        g.add((obj_uri, SOLVEIT_CORE.objectiveName, Literal(obj_name)))
+        triples.append((obj_uri, SOLVEIT_CORE.objectiveName, Literal(obj_name)))
 
         if obj_description:
-            g.add((obj_uri, SOLVEIT_CORE.objectiveDescription, Literal(obj_description)))
+            triples.append((obj_uri, SOLVEIT_CORE.objectiveDescription, Literal(obj_description)))
 
         # Link techniques to objectives
         for tech_id in objective.get('techniques', []):
-            tech_uri = SOLVEIT_DATA[f"technique{tech_id}"]
-            g.add((obj_uri, SOLVEIT_CORE.includesTechnique, tech_uri))
+            tech_uri = technique_uri(tech_id)
+            triples.append((obj_uri, SOLVEIT_CORE.includesTechnique, tech_uri))
+
+    g.addN((subject, predicate, obj, g) for subject, predicate, obj in triples)
+
+
+# rdflib's serializers issue many small writes, so give the output files a large buffer
+SERIALIZE_BUFFER_SIZE = 1 << 20
 
 
 def save_graph(g, output_dir, format_type='both'):
@@ -282,13 +329,15 @@ def save_graph(g, output_dir, format_type='both'):
     if format_type in ['ttl', 'both']:
         ttl_file = output_path / 'solve-it-kb.ttl'
         logger.info(f"Writing Turtle output to {ttl_file}")
-        g.serialize(destination=str(ttl_file), format='turtle')
+        with open(ttl_file, 'wb', buffering=SERIALIZE_BUFFER_SIZE) as ttl_stream:
+            g.serialize(destination=ttl_stream, format='turtle')
         logger.info(f"Turtle file written successfully: {ttl_file}")
 
     if format_type in ['jsonld', 'both']:
         jsonld_file = output_path / 'solve-it-kb.jsonld'
         logger.info(f"Writing JSON-LD output to {jsonld_file}")
-        g.serialize(destination=str(jsonld_file), format='json-ld')
+        with open(jsonld_file, 'wb', buffering=SERIALIZE_BUFFER_SIZE) as jsonld_stream:
+            g.serialize(destination=jsonld_stream, format='json-ld')
         logger.info(f"JSON-LD file written successfully: {jsonld_file}")
 
 
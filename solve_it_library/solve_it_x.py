@@ -1,10 +1,27 @@
+import hashlib
 import json
 import os
 import logging
 import sys
+import weakref
 import importlib.util
 from pathlib import Path
 
+# Parsed extension configs keyed by file path. Each entry stores the file's mtime
+# so an edited file is picked up on the next call.
+_extension_config_cache = {}
+
+# mtime of the file each loaded extension module (registered in sys.modules) was executed from
+_extension_module_mtimes = {}
+
+# Resolved extension code paths and module names for each project root, stored with the config
+# they were worked out from so they are only resolved again when the config file changes
+_extension_code_paths_cache = {}
+
+# Hook functions (or None where not defined) looked up on each loaded extension module. A module
+# that is re-executed after an edit is a new object, so its hooks are looked up again
+_extension_hooks_cache = weakref.WeakKeyDictionary()
+
 
 def get_extension_config(project_root):
     """
@@ -15,13 +32,20 @@ def get_extension_config(project_root):
     extension_data_path = os.path.join(project_root, 'extension_data')
     extension_config_path = os.path.join(extension_data_path, 'extension_config.json')
 
-    if os.path.exists(extension_config_path):
-        f = open(os.path.join(extension_data_path, 'extension_config.json'))
-        extension_config = json.loads(f.read())
-        return extension_config
-    else:
+    try:
+        mtime = os.stat(extension_config_path).st_mtime_ns
+    except FileNotFoundError:
         return None
 
+    cached = _extension_config_cache.get(extension_config_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(extension_config_path, 'rb') as f:
+        extension_config = json.load(f)
+    _extension_config_cache[extension_config_path] = (mtime, extension_config)
+    return extension_config
+
 
 def resolve_extension_path(extension_path, project_root):
     """Resolve extension path, trying absolute then relative to extension_data.
@@ -39,26 +63,54 @@ def resolve_extension_path(extension_path, project_root):
         sys.exit(-1)
 
 
-def load_module_from_path(module_path, module_name="temp_import"):
+def load_module_from_path(module_path, module_name=None):
     """Dynamically load a Python module from a file path.
 
+    Unless module_name is given, each file gets a stable module name derived from its
+    resolved path. The module is registered in sys.modules under that name, and is only
+    executed again if the file has changed since it was last loaded.
+
     Returns the loaded module object.
     """
-    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    resolved_path = str(Path(module_path).resolve())
+    if module_name is None:
+        module_name = get_module_name_for_path(resolved_path)
+    return load_module_if_changed(resolved_path, module_name)
+
+
+def get_module_name_for_path(resolved_path):
+    """Return the stable module name used for the module at an already resolved path"""
+    return "solveitx_" + hashlib.blake2b(resolved_path.encode(), digest_size=8).hexdigest()
+
+
+def load_module_if_changed(resolved_path, module_name):
+    """Return the module registered as module_name, executing resolved_path first if it has not
+    been loaded yet or the file has changed since."""
+    mtime = os.stat(resolved_path).st_mtime_ns
+
+    module = sys.modules.get(module_name)
+    if module is not None and _extension_module_mtimes.get(module_name) == mtime:
+        return module
+
+    spec = importlib.util.spec_from_file_location(module_name, resolved_path)
     module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+    # Register before executing, as a normal import does, so the module can refer to itself
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    _extension_module_mtimes[module_name] = mtime
     return module
 
 
-def load_extension_module(extension_folder, project_root):
-    """Load an extension module from its folder path.
+def get_extension_code_path(extension_folder, project_root):
+    """Return the path of an extension's extension_code.py, or exit with error if not found.
 
     Args:
         extension_folder: The folder path from extension config (absolute or relative)
         project_root: The project root directory
-
-    Returns:
-        The loaded extension module object
     """
     logging.debug(f'extension path listed in config: {extension_folder}')
 
@@ -66,12 +118,52 @@ def load_extension_module(extension_folder, project_root):
     extension_code_path = os.path.join(workable_path, 'extension_code.py')
 
     if os.path.exists(extension_code_path):
-        return load_module_from_path(extension_code_path)
+        return extension_code_path
     else:
         logging.error(f'Extension code not found at {extension_code_path} ({os.path.abspath(extension_code_path)})')
         sys.exit(-1)
 
 
+def load_extension_module(extension_folder, project_root):
+    """Load an extension module from its folder path.
+
+    Args:
+        extension_folder: The folder path from extension config (absolute or relative)
+        project_root: The project root directory
+
+    Returns:
+        The loaded extension module object
+    """
+    return load_module_from_path(get_extension_code_path(extension_folder, project_root))
+
+
+def get_extension_modules(project_root):
+    """Return the loaded module of each configured extension, in config order.
+
+    Extension paths are only resolved when the config is first loaded or has changed; after
+    that each call just checks whether any extension code file has been edited.
+
+    Returns None if there is no extension config.
+    """
+    extension_config = get_extension_config(project_root)
+
+    if extension_config is None:
+        return None
+
+    cached = _extension_code_paths_cache.get(project_root)
+    if cached is not None and cached[0] is extension_config:
+        code_paths = cached[1]
+    else:
+        code_paths = []
+        for each_extension in extension_config.get('extensions', {}).values():
+            extension_code_path = get_extension_code_path(each_extension.get('folder_path'), project_root)
+            resolved_path = str(Path(extension_code_path).resolve())
+            code_paths.append((resolved_path, get_module_name_for_path(resolved_path)))
+        _extension_code_paths_cache[project_root] = (extension_config, code_paths)
+
+    return [load_module_if_changed(resolved_path, module_name) for resolved_path, module_name in code_paths]
+
+
 def display_extension_info(project_root):
     """Display information about configured extensions and technique_fields settings.
 
@@ -125,6 +217,25 @@ def should_display_field(field_name, project_root):
     # Return the field's visibility setting, defaulting to True if not specified
     return extension_config.get('technique_fields').get(field_name, True)
 
+def get_extension_hook(extension_module, hook_name):
+    """Return the named hook function from an extension module, or None if it does not define one."""
+    hooks = _extension_hooks_cache.setdefault(extension_module, {})
+    if hook_name not in hooks:
+        hooks[hook_name] = getattr(extension_module, hook_name, None)
+    return hooks[hook_name]
+
+def iter_extension_hooks(hook_name):
+    """Yield the named hook function of each configured extension that defines it, in config order."""
+    extension_modules = get_extension_modules(Path(__file__).parent.parent)
+
+    if extension_modules is None:
+        return
+
+    for extension_module in extension_modules:
+        hook = get_extension_hook(extension_module, hook_name)
+        if hook is not None:
+            yield hook
+
 # ------------------
 # Markdown functions
 # ------------------
@@ -132,130 +243,37 @@ def should_display_field(field_name, project_root):
 def add_markdown_to_main_page():
     logging.debug('Called solve-it-x main markdown code')    
 
-    project_root = Path(__file__).parent.parent
-    extension_config = get_extension_config(project_root)
-
-    if extension_config is None:
-        return ""
-
-    total_markdown_to_add = ""
-
-    for each_extension in extension_config.get('extensions'):
-        extension_folder = extension_config.get('extensions').get(each_extension).get('folder_path')
-
-        extension_module = load_extension_module(extension_folder, project_root)
-
-        if hasattr(extension_module, 'get_markdown_generic'):
-            total_markdown_to_add += extension_module.get_markdown_generic()
-
-    return total_markdown_to_add
+    return "".join(hook() for hook in iter_extension_hooks('get_markdown_generic'))
 
 
 
 def add_markdown_to_technique(t_id):
     logging.debug('Called solve-it-x technique markdown code')    
 
-    project_root = Path(__file__).parent.parent
-    extension_config = get_extension_config(project_root)
-
-    if extension_config is None:
-        return ""
-
-    total_markdown_to_add = ""
-
-    for each_extension in extension_config.get('extensions'):
-        extension_folder = extension_config.get('extensions').get(each_extension).get('folder_path')
-
-        extension_module = load_extension_module(extension_folder, project_root)
-
-        if hasattr(extension_module, 'get_markdown_for_technique'):
-            total_markdown_to_add += extension_module.get_markdown_for_technique(t_id)
-
-    return total_markdown_to_add
+    return "".join(hook(t_id) for hook in iter_extension_hooks('get_markdown_for_technique'))
 
 
 def add_markdown_to_technique_preview_suffix(t_id):
     logging.debug('Called solve-it-x technique suffix code')    
 
-    project_root = Path(__file__).parent.parent
-    extension_config = get_extension_config(project_root)
-
-    if extension_config is None:
-        return ""
-
-    total_markdown_to_add = ""
-    for each_extension in extension_config.get('extensions'):
-        extension_folder = extension_config.get('extensions').get(each_extension).get('folder_path')
-        extension_module = load_extension_module(extension_folder, project_root)
-        if hasattr(extension_module, 'get_markdown_for_technique_suffix'):
-            total_markdown_to_add += extension_module.get_markdown_for_technique_suffix(t_id)
-
-    return total_markdown_to_add
+    return "".join(hook(t_id) for hook in iter_extension_hooks('get_markdown_for_technique_suffix'))
 
 
 def add_markdown_to_weakness(w_id):
     logging.debug('Called solve-it-x weakness markdown code')    
 
-    project_root = Path(__file__).parent.parent
-    extension_config = get_extension_config(project_root)
-
-    if extension_config is None:
-        return ""
-
-    total_markdown_to_add = ""
-
-    for each_extension in extension_config.get('extensions'):
-        extension_folder = extension_config.get('extensions').get(each_extension).get('folder_path')
-
-        extension_module = load_extension_module(extension_folder, project_root)
-
-        if hasattr(extension_module, 'get_markdown_for_weakness'):
-            total_markdown_to_add += extension_module.get_markdown_for_weakness(w_id)
-        
-    return total_markdown_to_add
+    return "".join(hook(w_id) for hook in iter_extension_hooks('get_markdown_for_weakness'))
 
 
 def add_markdown_to_weakness_preview_prefix(w_id):
     logging.debug('Called solve-it-x weakness prefix code')    
 
-    project_root = Path(__file__).parent.parent
-    extension_config = get_extension_config(project_root)
-
-    if extension_config is None:
-        return ""
-
-    total_markdown_to_add = ""
-
-    for each_extension in extension_config.get('extensions'):
-        extension_folder = extension_config.get('extensions').get(each_extension).get('folder_path')
-
-        extension_module = load_extension_module(extension_folder, project_root)
-
-        if hasattr(extension_module, 'get_markdown_for_weakness_prefix'):
-            total_markdown_to_add += extension_module.get_markdown_for_weakness_prefix(w_id)
-
-    return total_markdown_to_add
+    return "".join(hook(w_id) for hook in iter_extension_hooks('get_markdown_for_weakness_prefix'))
 
 def add_markdown_to_weakness_preview_suffix(w_id):
     logging.debug('Called solve-it-x weakness suffix code')    
 
-    project_root = Path(__file__).parent.parent
-    extension_config = get_extension_config(project_root)
-
-    if extension_config is None:
-        return ""
-
-    total_markdown_to_add = ""
-
-    for each_extension in extension_config.get('extensions'):
-        extension_folder = extension_config.get('extensions').get(each_extension).get('folder_path')
-
-        extension_module = load_extension_module(extension_folder, project_root)
-
-        if hasattr(extension_module, 'get_markdown_for_weakness_suffix'):
-            total_markdown_to_add += extension_module.get_markdown_for_weakness_suffix(w_id)
-
-    return total_markdown_to_add
+    return "".join(hook(w_id) for hook in iter_extension_hooks('get_markdown_for_weakness_suffix'))
 
 def add_markdown_to_mitigation(m_id):
     return ""
@@ -283,25 +301,21 @@ def add_html_to_mitigation(m_id):
 def edit_excel_technique(t_id, workbook, worksheet, start_row, kb=None):
     logging.debug('Called solve-it-x technique Excel code')
 
-    project_root = Path(__file__).parent.parent
-    extension_config = get_extension_config(project_root)
+    extension_modules = get_extension_modules(Path(__file__).parent.parent)
 
-    if extension_config is None:
+    if extension_modules is None:
         return worksheet
 
-    if len(extension_config.get('extensions')) > 0:
+    if len(extension_modules) > 0:
         bold_format2 = workbook.add_format()
         bold_format2.set_bold()
         bold_format2.set_text_wrap()
         worksheet.write_string(start_row, 0, "SOLVE-IT-X:", cell_format=bold_format2)
 
-    for each_extension in extension_config.get('extensions'):
-        extension_folder = extension_config.get('extensions').get(each_extension).get('folder_path')
-
-        extension_module = load_extension_module(extension_folder, project_root)
-
-        if hasattr(extension_module, 'get_excel_for_technique'):
-            worksheet = extension_module.get_excel_for_technique(t_id, worksheet, start_row+2, kb=kb)
+    for extension_module in extension_modules:
+        hook = get_extension_hook(extension_module, 'get_excel_for_technique')
+        if hook is not None:
+            worksheet = hook(t_id, worksheet, start_row+2, kb=kb)
 
     return worksheet
 
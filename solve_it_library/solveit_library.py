@@ -6,12 +6,21 @@ access to the SOLVE-IT data (techniques, weaknesses, mitigations).
 """
 
 import os
+import re
+import sys
 import json
+import hashlib
+import functools
 import logging
+import tempfile
 import importlib.util
+from collections import defaultdict
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Type, Union, Tuple
 from pydantic import ValidationError
 
+from . import models
 from .models import (
     Technique, Weakness, Mitigation, Objective,
     TechniqueValidationError, WeaknessValidationError, MitigationValidationError, ObjectiveValidationError,
@@ -23,6 +32,23 @@ logger = logging.getLogger(__name__)
 # Configure logging level (optional, could be configured by application)
 # logging.basicConfig(level=logging.INFO)
 
+# Words indexed for search; a search term matches with word boundaries exactly when it equals one of these
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
+
+# Quoted phrases in a search query
+SEARCH_PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+# Common words left out of search terms (along with words of two characters or fewer)
+SEARCH_STOP_WORDS = frozenset({'and', 'or', 'not', 'the', 'a', 'an', 'is', 'are', 'was', 'were'})
+
+# Base search score keyed by (matched in name, matched in description); the match counts are added to it
+SEARCH_BASE_SCORES = {(True, True): 100, (True, False): 50, (False, True): 10, (False, False): 0}
+
+# Default colour and prefix of a technique, indexed by its status: placeholder, partially populated,
+# release candidate
+TECHNIQUE_STATUS_COLOURS = ("#F4CCCC", "#FCE5CD", "#D9EAD3")
+TECHNIQUE_STATUS_PREFIXES = ("🔴 ", "🟡 ", "🟢 ")
+
 class KnowledgeBase:
     """
     Provides an interface to load and query the SOLVE-IT knowledge base.
@@ -46,8 +72,13 @@ class KnowledgeBase:
             extension name.
     """
     DEFAULT_MAPPING_FILE = "solve-it.json"
+    # Cache of the validated techniques, weaknesses, mitigations and reverse indices, stored in base_path
+    CACHE_FILE = ".solveit_cache.json"
+    # Bump if the layout of the cache file changes
+    CACHE_FORMAT_VERSION = 3
 
-    def __init__(self, base_path: str, mapping_file: str = DEFAULT_MAPPING_FILE, enable_extensions: bool = True):
+    def __init__(self, base_path: str, mapping_file: str = DEFAULT_MAPPING_FILE, enable_extensions: bool = True,
+                 use_cache: bool = True):
         """
         Initializes the KnowledgeBase by loading data from the specified path.
 
@@ -56,6 +87,9 @@ class KnowledgeBase:
                 repository clone (containing the 'data' folder).
             mapping_file (str): The name of the objective mapping file to load.
             enable_extensions (bool): Whether to load SOLVE-IT-X extensions. Default is True.
+            use_cache (bool): Whether to load the core data from, and save it to, a cache file in
+                base_path. The cache is only used if no data file has changed since it was written.
+                Default is True.
 
         Raises:
             FileNotFoundError: If the base_path or essential subdirectories
@@ -81,26 +115,61 @@ class KnowledgeBase:
         self.weaknesses: Dict[str, Dict[str, Any]] = {}
         self.mitigations: Dict[str, Dict[str, Any]] = {}
         self.objective_mappings: Dict[str, List[Dict[str, Any]]] = {}
+        # Objectives of each loaded mapping keyed by objective name, for lookups by name
+        self._objective_by_name: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Names of the objectives listing each technique, for each loaded mapping
+        self._objective_names_by_technique: Dict[str, Dict[str, List[str]]] = {}
         self.current_mapping_name: Optional[str] = None
 
         # Initialize reverse lookup indices
         self._weakness_to_techniques: Dict[str, List[str]] = {}
         self._mitigation_to_weaknesses: Dict[str, List[str]] = {}
         self._mitigation_to_techniques: Dict[str, List[str]] = {}
+        self._technique_to_mitigations: Dict[str, List[str]] = {}
+        self._subtechnique_to_parent: Dict[str, str] = {}
+
+        # Sorted IDs of each collection with the collection they were sorted from, built on first use
+        self._sorted_ids: Dict[str, Tuple[Dict[str, Dict[str, Any]], Tuple[str, ...]]] = {}
+
+        # Default status of each technique with the technique it was worked out from, built on first use
+        self._technique_statuses: Dict[str, Tuple[Optional[Dict[str, Any]], int]] = {}
+
+        # Lowercased text and word postings of each collection, built on the first search of it
+        self._search_indexes: Dict[str, Dict[str, Any]] = {}
 
         # Initialize extension storage
         self.extension_config: Optional[Dict[str, Any]] = None
         self.extension_modules: Dict[str, Any] = {}
+        # (extension name, function) of each loaded extension defining a function, keyed by function
+        # name, filled in on the first call of each function
+        self._extension_dispatch: Dict[str, List[Tuple[str, Any]]] = {}
+        # Number of failed calls of each (extension name, function name), used to thin out the error log
+        self._extension_error_counts: Dict[Tuple[str, str], int] = {}
         self._extensions_enabled: bool = enable_extensions
+        # Whether has_extensions() is true, set once extensions are loaded so the per-item
+        # add_markdown_to_*/add_excel_to_* wrappers can return straight away without them
+        self._extensions_active: bool = False
+        # Technique fields the extension config turns off, checked by should_display_field
+        self._hidden_fields: frozenset = frozenset()
         self.global_config: Optional[Any] = None
 
-        # Load core data
-        self._load_techniques()
-        self._load_weaknesses()
-        self._load_mitigations()
+        # Load core data, from the cache if none of the data files have changed since it was written
+        cache_path = os.path.join(self.base_path, self.CACHE_FILE)
+        fingerprint = self._compute_data_fingerprint() if use_cache else None
+        if not (use_cache and self._load_core_data_from_cache(cache_path, fingerprint)):
+            self._load_techniques()
+            self._load_weaknesses()
+            self._load_mitigations()
+
+            # Build reverse indices for performance optimization
+            self._build_reverse_indices()
 
-        # Build reverse indices for performance optimization
-        self._build_reverse_indices()
+            # Saved before extensions are loaded, as they add extension data to the items
+            if use_cache:
+                self._save_core_data_to_cache(cache_path, fingerprint)
+
+        self._intern_ids()
+        self._build_subtechnique_index()
 
         # Load the specified objective mapping
         if not self.load_objective_mapping(mapping_file):
@@ -118,6 +187,13 @@ class KnowledgeBase:
         # Load extensions if enabled
         if enable_extensions:
             self._load_extensions()
+            self._extensions_active = self.has_extensions()
+            if self.extension_config is not None:
+                self._hidden_fields = frozenset(
+                    field_name
+                    for field_name, is_visible in self.extension_config.get('technique_fields', {}).items()
+                    if not is_visible
+                )
             self._load_global_config()
             self._load_extension_data_for_items()
 
@@ -145,53 +221,95 @@ class KnowledgeBase:
             logger.warning("Directory not found, skipping load: %s", directory_path)
             return loaded_data
 
-        for filename in os.listdir(directory_path):
-            if filename.lower().endswith('.json'):
-                file_path = os.path.join(directory_path, filename)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        
-                        # Validate the data against the model
-                        try:
-                            validated_data = model_class.model_validate(data)
-                            item_id = validated_data.id
-                            # Convert back to dict for compatibility with existing code
-                            loaded_data[item_id] = validated_data.model_dump()
-                        except ValidationError as e:
-                            # Determine the appropriate exception type based on the model class
-                            if model_class == Technique:
-                                error_class = TechniqueValidationError
-                            elif model_class == Weakness:
-                                error_class = WeaknessValidationError
-                            elif model_class == Mitigation:
-                                error_class = MitigationValidationError
-                            else:
-                                error_class = Exception
-                            
-                            # Log the validation error with details
-                            logger.error(
-                                "Validation error in %s: %s",
-                                file_path,
-                                e.errors()
-                            )
-                            
-                            # Raise exception if invalid JSON encountered
-                            raise SOLVEITDataError(f"Could not load data from {file_path}")
-                                                
-
-                except json.JSONDecodeError as e:
-                    logger.error("Could not decode JSON from %s: %s", file_path, e)
-                    raise SOLVEITDataError("Could not decode JSON from %s: %s", file_path, e)
-                except IOError as e:
-                    logger.error("Could not read file %s: %s", file_path, e)
-                    raise SOLVEITDataError("Could not read file %s: %s", file_path, e)
-                except Exception as e:
-                    logger.error("Unexpected error processing %s: %s", file_path, e)
-                    raise SOLVEITDataError("Unexpected error processing %s: %s", file_path, e)
+        # scandir entries know whether they are files without a separate stat call
+        with os.scandir(directory_path) as entries:
+            file_paths = [
+                entry.path
+                for entry in entries
+                if entry.name.lower().endswith('.json') and entry.is_file()
+            ]
+
+        # Each file is read and validated independently, so they are processed concurrently.
+        # map returns the results (and raises any error) in directory listing order
+        with ThreadPoolExecutor() as executor:
+            for item_id, item_data in executor.map(lambda file_path: self._load_json_file(file_path, model_class),
+                                                   file_paths):
+                loaded_data[item_id] = item_data
         
         return loaded_data
 
+    def _load_json_file(self, file_path: str, model_class: Type[Union[Technique, Weakness, Mitigation]]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Loads a single JSON file and validates it against a Pydantic model.
+
+        Args:
+            file_path (str): The path to the JSON file.
+            model_class (Type): The Pydantic model class to validate the data against.
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: The item ID and the validated data as a dictionary.
+
+        Raises:
+            SOLVEITDataError: If the file cannot be read, decoded or validated.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                raw_data = f.read()
+                
+                # Validate the data against the model
+                try:
+                    validated_data = self._parse_and_validate(raw_data, model_class)
+                    # Convert back to dict for compatibility with existing code. The models only hold
+                    # plain values, so a copy of the field dict matches model_dump without walking it again
+                    return validated_data.id, dict(validated_data.__dict__)
+                except ValidationError as e:
+                    # Determine the appropriate exception type based on the model class
+                    if model_class == Technique:
+                        error_class = TechniqueValidationError
+                    elif model_class == Weakness:
+                        error_class = WeaknessValidationError
+                    elif model_class == Mitigation:
+                        error_class = MitigationValidationError
+                    else:
+                        error_class = Exception
+                    
+                    # Log the validation error with details
+                    logger.error(
+                        "Validation error in %s: %s",
+                        file_path,
+                        e.errors()
+                    )
+                    
+                    # Raise exception if invalid JSON encountered
+                    raise SOLVEITDataError(f"Could not load data from {file_path}")
+                                        
+
+        except json.JSONDecodeError as e:
+            logger.error("Could not decode JSON from %s: %s", file_path, e)
+            raise SOLVEITDataError("Could not decode JSON from %s: %s", file_path, e)
+        except IOError as e:
+            logger.error("Could not read file %s: %s", file_path, e)
+            raise SOLVEITDataError("Could not read file %s: %s", file_path, e)
+        except Exception as e:
+            logger.error("Unexpected error processing %s: %s", file_path, e)
+            raise SOLVEITDataError("Unexpected error processing %s: %s", file_path, e)
+
+    @staticmethod
+    def _parse_and_validate(raw_data: bytes, model_class: Type[Union[Technique, Weakness, Mitigation]]):
+        """
+        Parses JSON bytes and validates them against a Pydantic model in one step, using
+        Pydantic's JSON parser rather than json.load followed by model_validate.
+
+        Anything Pydantic cannot parse as JSON goes through json.loads instead, so files
+        that cannot be decoded still raise json.JSONDecodeError.
+        """
+        try:
+            return model_class.model_validate_json(raw_data)
+        except ValidationError as e:
+            if not any(error['type'] == 'json_invalid' for error in e.errors()):
+                raise
+        return model_class.model_validate(json.loads(raw_data))
+
     def _load_techniques(self):
         """Loads techniques from the techniques directory."""
         self.techniques = self._load_json_files(self.techniques_path, Technique)
@@ -215,46 +333,198 @@ class KnowledgeBase:
         - weakness_id -> [technique_ids] that reference it
         - mitigation_id -> [weakness_ids] that reference it  
         - mitigation_id -> [technique_ids] that reference it (through weaknesses)
+        - technique_id -> [mitigation_ids] it references (through weaknesses), in the order first seen
         """
         logger.info("Building reverse indices for performance optimization...")
         
-        # Initialize empty indices
-        self._weakness_to_techniques = {}
-        self._mitigation_to_weaknesses = {}
-        self._mitigation_to_techniques = {}
-        
         # Build weakness -> techniques mapping
+        weakness_to_techniques = defaultdict(list)
         for technique_id, technique in self.techniques.items():
             for weakness_id in technique.get('weaknesses', []):
-                if weakness_id not in self._weakness_to_techniques:
-                    self._weakness_to_techniques[weakness_id] = []
-                self._weakness_to_techniques[weakness_id].append(technique_id)
+                weakness_to_techniques[weakness_id].append(technique_id)
         
         # Build mitigation -> weaknesses mapping
+        mitigation_to_weaknesses = defaultdict(list)
         for weakness_id, weakness in self.weaknesses.items():
             for mitigation_id in weakness.get('mitigations', []):
-                if mitigation_id not in self._mitigation_to_weaknesses:
-                    self._mitigation_to_weaknesses[mitigation_id] = []
-                self._mitigation_to_weaknesses[mitigation_id].append(weakness_id)
+                mitigation_to_weaknesses[mitigation_id].append(weakness_id)
+        
+        # Stored as plain dicts so that lookups of unknown IDs do not add entries
+        self._weakness_to_techniques = dict(weakness_to_techniques)
+        self._mitigation_to_weaknesses = dict(mitigation_to_weaknesses)
         
         # Build mitigation -> techniques mapping (through weaknesses)
+        self._mitigation_to_techniques = {}
         for mitigation_id, weakness_ids in self._mitigation_to_weaknesses.items():
             technique_ids = set()  # Use set to avoid duplicates
             for weakness_id in weakness_ids:
-                technique_ids.update(self._weakness_to_techniques.get(weakness_id, []))
-            self._mitigation_to_techniques[mitigation_id] = sorted(list(technique_ids))
+                technique_ids.update(self._weakness_to_techniques.get(weakness_id, ()))
+            self._mitigation_to_techniques[mitigation_id] = sorted(technique_ids)
+        
+        # Build technique -> mitigations mapping (through weaknesses). Kept in the order the
+        # mitigations are first reached, as returned by get_mit_list_for_technique; keys of a
+        # dict keep that order while deduplicating them
+        self._technique_to_mitigations = {}
+        weaknesses = self.weaknesses
+        for technique_id, technique in self.techniques.items():
+            mitigation_ids = list(dict.fromkeys(
+                mitigation_id
+                for weakness in map(weaknesses.get, technique.get('weaknesses', ())) if weakness
+                for mitigation_id in weakness.get('mitigations', ())
+            ))
+            if mitigation_ids:
+                self._technique_to_mitigations[technique_id] = mitigation_ids
         
         # Sort all reverse index lists for consistent output
-        for weakness_id in self._weakness_to_techniques:
-            self._weakness_to_techniques[weakness_id].sort()
+        for technique_ids in self._weakness_to_techniques.values():
+            technique_ids.sort()
         
-        for mitigation_id in self._mitigation_to_weaknesses:
-            self._mitigation_to_weaknesses[mitigation_id].sort()
+        for weakness_ids in self._mitigation_to_weaknesses.values():
+            weakness_ids.sort()
         
-        logger.info("Reverse indices built: %d weakness->technique, %d mitigation->weakness, %d mitigation->technique",
+        logger.info("Reverse indices built: %d weakness->technique, %d mitigation->weakness, %d mitigation->technique, "
+                    "%d technique->mitigation",
                     len(self._weakness_to_techniques), 
                     len(self._mitigation_to_weaknesses),
-                    len(self._mitigation_to_techniques))
+                    len(self._mitigation_to_techniques),
+                    len(self._technique_to_mitigations))
+
+    def _intern_ids(self):
+        """
+        Interns the item IDs used as dictionary keys, in the relationship fields of each item and in
+        the reverse indices, so each ID string is held in memory once however many items refer to it,
+        and dictionary lookups with them can match on identity.
+        """
+        intern = sys.intern
+
+        def intern_keys(items: Dict[str, Any]) -> Dict[str, Any]:
+            return {intern(item_id): value for item_id, value in items.items()}
+
+        self.techniques = intern_keys(self.techniques)
+        self.weaknesses = intern_keys(self.weaknesses)
+        self.mitigations = intern_keys(self.mitigations)
+
+        for item_id, technique in self.techniques.items():
+            technique['id'] = item_id
+            technique['weaknesses'] = [intern(weakness_id) for weakness_id in technique.get('weaknesses', [])]
+            technique['subtechniques'] = [intern(subtechnique_id) for subtechnique_id in technique.get('subtechniques', [])]
+        for item_id, weakness in self.weaknesses.items():
+            weakness['id'] = item_id
+            weakness['mitigations'] = [intern(mitigation_id) for mitigation_id in weakness.get('mitigations', [])]
+        for item_id, mitigation in self.mitigations.items():
+            mitigation['id'] = item_id
+            if mitigation.get('technique'):
+                mitigation['technique'] = intern(mitigation['technique'])
+
+        for index_name in ('_weakness_to_techniques', '_mitigation_to_weaknesses', '_mitigation_to_techniques',
+                           '_technique_to_mitigations'):
+            setattr(self, index_name, {intern(item_id): [intern(related_id) for related_id in related_ids]
+                                       for item_id, related_ids in getattr(self, index_name).items()})
+
+    def _build_subtechnique_index(self):
+        """
+        Builds the subtechnique_id -> parent technique_id index. A subtechnique listed by more than
+        one technique is given the parent with the lowest ID.
+        """
+        subtechnique_to_parent = {}
+        for technique_id in sorted(self.techniques):
+            for subtechnique_id in self.techniques[technique_id].get('subtechniques', []):
+                subtechnique_to_parent.setdefault(subtechnique_id, technique_id)
+        self._subtechnique_to_parent = subtechnique_to_parent
+
+    def _compute_data_fingerprint(self) -> str:
+        """
+        Computes a fingerprint of the technique, weakness and mitigation files from their names,
+        modification times and sizes, without reading them. The library and model source files
+        are included so that code changes also invalidate the cache.
+
+        Returns:
+            str: Hex digest identifying the current state of the data files.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"{self.CACHE_FORMAT_VERSION}\n".encode())
+
+        for source_path in (__file__, models.__file__):
+            stat = os.stat(source_path)
+            hasher.update(f"{os.path.basename(source_path)}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+
+        for directory_path in (self.techniques_path, self.weaknesses_path, self.mitigations_path):
+            hasher.update(f"{os.path.basename(directory_path)}\n".encode())
+            with os.scandir(directory_path) as entries:
+                for entry in sorted(entries, key=lambda entry: entry.name):
+                    if entry.name.lower().endswith('.json'):
+                        stat = entry.stat()
+                        hasher.update(f"{entry.name}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+
+        return hasher.hexdigest()
+
+    def _load_core_data_from_cache(self, cache_path: str, fingerprint: str) -> bool:
+        """
+        Loads techniques, weaknesses, mitigations and the reverse indices from the cache file,
+        if it exists and was written for the same fingerprint.
+
+        Args:
+            cache_path (str): Path to the cache file.
+            fingerprint (str): Fingerprint of the current data files.
+
+        Returns:
+            bool: True if the data was loaded from the cache, False otherwise.
+        """
+        try:
+            with open(cache_path, 'rb') as f:
+                cache = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read cache file %s, loading data files instead: %s", cache_path, e)
+            return False
+
+        if not isinstance(cache, dict) or cache.get('fingerprint') != fingerprint:
+            logger.info("Cache file %s is out of date, loading data files instead.", cache_path)
+            return False
+
+        self.techniques = cache['techniques']
+        self.weaknesses = cache['weaknesses']
+        self.mitigations = cache['mitigations']
+        self._weakness_to_techniques = cache['weakness_to_techniques']
+        self._mitigation_to_weaknesses = cache['mitigation_to_weaknesses']
+        self._mitigation_to_techniques = cache['mitigation_to_techniques']
+        self._technique_to_mitigations = cache['technique_to_mitigations']
+        logger.info("Loaded %d techniques, %d weaknesses and %d mitigations from cache %s.",
+                    len(self.techniques), len(self.weaknesses), len(self.mitigations), cache_path)
+        return True
+
+    def _save_core_data_to_cache(self, cache_path: str, fingerprint: str):
+        """
+        Saves techniques, weaknesses, mitigations and the reverse indices to the cache file.
+        The file is written under a temporary name and then renamed, so a partly written cache
+        is never read. Failing to write the cache (e.g. a read-only base_path) is not an error.
+
+        Args:
+            cache_path (str): Path to the cache file.
+            fingerprint (str): Fingerprint of the data files the data was loaded from.
+        """
+        cache = {
+            'fingerprint': fingerprint,
+            'techniques': self.techniques,
+            'weaknesses': self.weaknesses,
+            'mitigations': self.mitigations,
+            'weakness_to_techniques': self._weakness_to_techniques,
+            'mitigation_to_weaknesses': self._mitigation_to_weaknesses,
+            'mitigation_to_techniques': self._mitigation_to_techniques,
+            'technique_to_mitigations': self._technique_to_mitigations,
+        }
+        temp_path = None
+        try:
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.base_path,
+                                             prefix=self.CACHE_FILE, suffix='.tmp', delete=False) as f:
+                temp_path = f.name
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logger.warning("Could not write cache file %s: %s", cache_path, e)
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
 
     def load_objective_mapping(self, mapping_filename: str) -> bool:
         """
@@ -272,7 +542,7 @@ class KnowledgeBase:
             return False
 
         try:
-            with open(mapping_path, 'r', encoding='utf-8') as f:
+            with open(mapping_path, 'rb') as f:
                 mapping_data = json.load(f)
                 if isinstance(mapping_data, list):
                     # Validate each objective in the mapping
@@ -293,6 +563,17 @@ class KnowledgeBase:
                     
                     # Store the validated objectives
                     self.objective_mappings[mapping_filename] = validated_objectives
+                    objective_by_name = {}
+                    for objective in validated_objectives:
+                        # If a name is repeated the first objective with it is used, as in a linear search
+                        objective_by_name.setdefault(objective['name'], objective)
+                    self._objective_by_name[mapping_filename] = objective_by_name
+                    objective_names_by_technique = defaultdict(list)
+                    for objective in validated_objectives:
+                        # Each objective is listed once for a technique, however often it names it
+                        for technique_id in dict.fromkeys(objective.get('techniques', [])):
+                            objective_names_by_technique[technique_id].append(objective.get('name'))
+                    self._objective_names_by_technique[mapping_filename] = dict(objective_names_by_technique)
                     self.current_mapping_name = mapping_filename
                     
                     # Log success message with mapping details
@@ -331,10 +612,11 @@ class KnowledgeBase:
         mapping_files = []
         excluded_dirs = ['techniques', 'weaknesses', 'mitigations']
         try:
-            for filename in os.listdir(self.data_path):
-                # Check if it's a file, ends with .json, and not in excluded dirs (implicit check)
-                full_path = os.path.join(self.data_path, filename)
-                if os.path.isfile(full_path) and filename.lower().endswith('.json'):
+            with os.scandir(self.data_path) as entries:
+                filenames = [entry.name for entry in entries if entry.is_file()]
+            for filename in filenames:
+                # Check if it ends with .json and is not in excluded dirs (implicit check)
+                if filename.lower().endswith('.json'):
                     # Basic check to exclude known subdirs - assumes mappings
                     # are top-level in data/
                     is_subdir_file = False
@@ -363,12 +645,27 @@ class KnowledgeBase:
                 containing 'name', 'description', 'techniques'). Returns an empty
                 list if no mapping is loaded or the specified mapping doesn't exist.
         """
+        # Return a copy to prevent external modification
+        return [obj.copy() for obj in self._get_objectives(mapping_name)]
+
+    def _get_objectives(self, mapping_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the stored objectives of the specified or current mapping without copying them,
+        for use within the library where they are only read.
+
+        Args:
+            mapping_name (Optional[str]): The filename of the mapping to use.
+                                          If None, uses the currently loaded mapping.
+
+        Returns:
+            List[Dict[str, Any]]: The stored list of objective dictionaries, or an empty
+                list if no mapping is loaded or the specified mapping doesn't exist.
+        """
         active_mapping_name = mapping_name or self.current_mapping_name
         if not active_mapping_name or active_mapping_name not in self.objective_mappings:
             logger.warning("No objective mapping loaded or '%s' not found.", active_mapping_name)
             return []
-        # Return a copy to prevent external modification
-        return [obj.copy() for obj in self.objective_mappings[active_mapping_name]]
+        return self.objective_mappings[active_mapping_name]
 
     def get_techniques_for_objective(self, objective_name: str, mapping_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -389,33 +686,28 @@ class KnowledgeBase:
             Warning if an objective references a technique ID that doesn't exist.
         """
         active_mapping_name = mapping_name or self.current_mapping_name
-        objectives = self.list_objectives(active_mapping_name)
-        if not objectives:
+        if not active_mapping_name or active_mapping_name not in self.objective_mappings:
+            logger.warning("No objective mapping loaded or '%s' not found.", active_mapping_name)
             return []
 
-        found_objective = None
-        for obj in objectives:
-            if obj.get('name') == objective_name:
-                found_objective = obj
-                break
+        found_objective = self._objective_by_name[active_mapping_name].get(objective_name)
 
         if not found_objective:
             return []
 
         technique_ids = found_objective.get('techniques', [])
-        associated_techniques = []
-        for t_id in technique_ids:
-            technique = self.get_technique(t_id)
-            if technique:
-                associated_techniques.append(technique)
-            else:
-                # Log a warning about missing technique
-                logger.warning(
-                    "Objective '%s' in mapping '%s' references non-existent technique %s",
-                    objective_name,
-                    active_mapping_name,
-                    t_id
-                )
+        techniques = self.techniques
+        associated_techniques = [technique for t_id in technique_ids if (technique := techniques.get(t_id)) is not None]
+        if len(associated_techniques) != len(technique_ids) and logger.isEnabledFor(logging.WARNING):
+            for t_id in technique_ids:
+                if t_id not in techniques:
+                    # Log a warning about missing technique
+                    logger.warning(
+                        "Objective '%s' in mapping '%s' references non-existent technique %s",
+                        objective_name,
+                        active_mapping_name,
+                        t_id
+                    )
         return associated_techniques
 
     def get_technique(self, technique_id: str) -> Optional[Dict[str, Any]]:
@@ -471,17 +763,16 @@ class KnowledgeBase:
             return []
 
         weakness_ids = technique.get('weaknesses', [])
-        associated_weaknesses = []
-        for w_id in weakness_ids:
-            weakness = self.get_weakness(w_id)
-            if weakness:
-                associated_weaknesses.append(weakness)
-            else:
-                logger.warning(
-                    "Technique %s references non-existent weakness %s",
-                    technique_id,
-                    w_id
-                )
+        weaknesses = self.weaknesses
+        associated_weaknesses = [weakness for w_id in weakness_ids if (weakness := weaknesses.get(w_id)) is not None]
+        if len(associated_weaknesses) != len(weakness_ids) and logger.isEnabledFor(logging.WARNING):
+            for w_id in weakness_ids:
+                if w_id not in weaknesses:
+                    logger.warning(
+                        "Technique %s references non-existent weakness %s",
+                        technique_id,
+                        w_id
+                    )
         return associated_weaknesses
 
     def get_mitigations_for_weakness(self, weakness_id: str) -> List[Dict[str, Any]]:
@@ -501,17 +792,16 @@ class KnowledgeBase:
             return []
 
         mitigation_ids = weakness.get('mitigations', [])
-        associated_mitigations = []
-        for m_id in mitigation_ids:
-            mitigation = self.get_mitigation(m_id)
-            if mitigation:
-                associated_mitigations.append(mitigation)
-            else:
-                logger.warning(
-                    "Weakness %s references non-existent mitigation %s",
-                    weakness_id,
-                    m_id
-                )
+        mitigations = self.mitigations
+        associated_mitigations = [mitigation for m_id in mitigation_ids if (mitigation := mitigations.get(m_id)) is not None]
+        if len(associated_mitigations) != len(mitigation_ids) and logger.isEnabledFor(logging.WARNING):
+            for m_id in mitigation_ids:
+                if m_id not in mitigations:
+                    logger.warning(
+                        "Weakness %s references non-existent mitigation %s",
+                        weakness_id,
+                        m_id
+                    )
         return associated_mitigations
 
     def get_techniques_for_weakness(self, weakness_id: str) -> List[Dict[str, Any]]:
@@ -539,13 +829,12 @@ class KnowledgeBase:
         technique_ids = self._weakness_to_techniques.get(weakness_id, [])
         
         # Convert IDs to full technique objects
-        associated_techniques = []
-        for technique_id in technique_ids:
-            technique = self.get_technique(technique_id)
-            if technique:
-                associated_techniques.append(technique)
-            else:
-                logger.warning("Index inconsistency: technique %s not found", technique_id)
+        techniques = self.techniques
+        associated_techniques = [technique for technique_id in technique_ids if (technique := techniques.get(technique_id)) is not None]
+        if len(associated_techniques) != len(technique_ids) and logger.isEnabledFor(logging.WARNING):
+            for technique_id in technique_ids:
+                if technique_id not in techniques:
+                    logger.warning("Index inconsistency: technique %s not found", technique_id)
 
         if not associated_techniques:
             logger.debug("No techniques found that reference weakness %s.", weakness_id)
@@ -577,13 +866,12 @@ class KnowledgeBase:
         weakness_ids = self._mitigation_to_weaknesses.get(mitigation_id, [])
         
         # Convert IDs to full weakness objects
-        associated_weaknesses = []
-        for weakness_id in weakness_ids:
-            weakness = self.get_weakness(weakness_id)
-            if weakness:
-                associated_weaknesses.append(weakness)
-            else:
-                logger.warning("Index inconsistency: weakness %s not found", weakness_id)
+        weaknesses = self.weaknesses
+        associated_weaknesses = [weakness for weakness_id in weakness_ids if (weakness := weaknesses.get(weakness_id)) is not None]
+        if len(associated_weaknesses) != len(weakness_ids) and logger.isEnabledFor(logging.WARNING):
+            for weakness_id in weakness_ids:
+                if weakness_id not in weaknesses:
+                    logger.warning("Index inconsistency: weakness %s not found", weakness_id)
 
         if not associated_weaknesses:
             logger.debug("No weaknesses found that reference mitigation %s.", mitigation_id)
@@ -765,12 +1053,45 @@ class KnowledgeBase:
             Dict[str, List[Dict[str, Any]]]: Search results sorted by relevance
         """
         search_logic = search_logic.upper()
+        patterns = self._compile_search_patterns(search_terms, phrases, substring_match)
+        any_pattern = patterns['any']
+        # A single whole word is the most common query, and is scored from the word sets alone
+        single_word = search_terms[0] if len(search_terms) == 1 and not phrases and patterns['terms_are_words'] else None
         
         for collection_name, collection in collections_to_search.items():
             scored_results = []
+            search_index = self._get_search_index(collection_name, collection)
+            search_texts = search_index['texts']
+            search_tokens = search_index['tokens']
             
-            for _, item in collection.items():
-                score = self._calculate_search_score(item, search_terms, phrases, substring_match, search_logic)
+            # Only items containing the words of the query can match, so just those are scored,
+            # in collection order so that equal scores keep their order
+            candidates = self._find_search_candidates(search_index, search_terms, phrases, substring_match, search_logic)
+            if candidates is None:
+                item_ids = collection.keys()
+            else:
+                item_ids = sorted(candidates, key=search_index['positions'].__getitem__)
+            
+            if single_word is not None:
+                # Every candidate contains the word, and the OR multiplier does not apply to one term
+                for item_id in item_ids:
+                    name_tokens, desc_tokens = search_tokens[item_id]
+                    found_in_name = single_word in name_tokens
+                    found_in_desc = single_word in desc_tokens
+                    scored_results.append((collection[item_id],
+                                           SEARCH_BASE_SCORES[found_in_name, found_in_desc] + found_in_name + found_in_desc))
+                results[collection_name] = self._sort_search_results(scored_results)
+                continue
+            
+            for item_id in item_ids:
+                item = collection[item_id]
+                name, description = search_texts[item_id]
+                # An item matching none of the terms or phrases scores 0 under either search logic.
+                # Candidates always contain the words of a term or phrase, so only check the rest
+                if candidates is None and not (any_pattern.search(name) or any_pattern.search(description)):
+                    continue
+                score = self._score_search_text(name, description, search_terms, phrases, substring_match, search_logic,
+                                                patterns, search_tokens[item_id])
                 if score > 0:
                     scored_results.append((item, score))
             
@@ -779,6 +1100,178 @@ class KnowledgeBase:
 
         return results
 
+    def _get_search_index(self, collection_name: str, collection: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get the search index of a collection, building it if the collection has not been searched
+        before or has been replaced or resized since.
+        
+        Args:
+            collection_name: Name of the collection ('techniques', 'weaknesses' or 'mitigations')
+            collection: The collection of items
+            
+        Returns:
+            Dict[str, Any]: Lowercased (name, description) of each item keyed by item ID ('texts'),
+                            the sets of words in them keyed by item ID ('tokens'), the IDs of the
+                            items containing each word of their name or description keyed by word
+                            ('postings'), and the position of each item ID in the collection
+                            ('positions')
+        """
+        search_index = self._search_indexes.get(collection_name)
+        if search_index is None or search_index['collection'] is not collection \
+                or len(search_index['texts']) != len(collection):
+            texts = {}
+            tokens = {}
+            postings = defaultdict(set)
+            for item_id, item in collection.items():
+                name, description = texts[item_id] = self._get_item_search_text(item)
+                name_tokens = frozenset(SEARCH_TOKEN_PATTERN.findall(name))
+                desc_tokens = frozenset(SEARCH_TOKEN_PATTERN.findall(description))
+                tokens[item_id] = (name_tokens, desc_tokens)
+                for token in name_tokens | desc_tokens:
+                    postings[token].add(item_id)
+            search_index = {
+                'collection': collection,
+                'texts': texts,
+                'tokens': tokens,
+                'postings': dict(postings),
+                'positions': {item_id: position for position, item_id in enumerate(collection)},
+            }
+            self._search_indexes[collection_name] = search_index
+        return search_index
+
+    def _find_search_candidates(self, search_index: Dict[str, Any], terms: List[str], phrases: List[str],
+                                substring_match: bool, search_logic: str) -> Optional[set]:
+        """
+        Find the IDs of the items that can match a query, from the words indexed for a collection.
+        
+        Every word of a term or phrase must appear in a matching item: as a whole word with word
+        boundary matching, or inside a longer word with substring matching. The candidates can
+        include items that do not match (e.g. a phrase whose words are all present but not in
+        order), so they still need scoring.
+        
+        Args:
+            search_index: Search index from _get_search_index
+            terms: List of search terms
+            phrases: List of quoted phrases
+            substring_match: Whether to use substring matching
+            search_logic: Search logic ('AND' or 'OR')
+            
+        Returns:
+            Optional[set]: Candidate item IDs, or None if any item could match
+        """
+        postings = search_index['postings']
+
+        def items_containing(word: str) -> set:
+            if not substring_match:
+                return postings.get(word, set())
+            return set().union(*(item_ids for token, item_ids in postings.items() if word in token))
+
+        candidate_sets = []
+        for text in (*terms, *phrases):
+            words = SEARCH_TOKEN_PATTERN.findall(text)
+            if not words:
+                # Nothing to look up, so any item could contain it
+                if search_logic == "OR":
+                    return None
+                continue
+            candidate_sets.append(set.intersection(*(items_containing(word) for word in words)))
+
+        if not candidate_sets:
+            return None
+        if search_logic == "AND":
+            return set.intersection(*candidate_sets)
+        return set.union(*candidate_sets)
+
+    @staticmethod
+    def _get_item_search_text(item: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Get the lowercased name and description of an item, as matched by search.
+        
+        Args:
+            item: The item
+            
+        Returns:
+            Tuple[str, str]: Lowercased name and description
+        """
+        return str(item.get("name", "")).lower(), str(item.get("description", "")).lower()
+
+    def _compile_search_patterns(self, terms: List[str], phrases: List[str], substring_match: bool) -> Dict[str, Any]:
+        """
+        Compile the patterns used to match search terms, so they are compiled once per search
+        rather than for every item. Phrases are matched with str.find (see _contains_phrase).
+        
+        Args:
+            terms: List of search terms
+            phrases: List of quoted phrases
+            substring_match: Whether to use substring matching
+            
+        Returns:
+            Dict[str, Any]: Compiled pattern of each term ('terms'), a single pattern matching
+                            any of the terms or phrases ('any'), and whether every term is matched
+                            exactly by a single indexed word, so can be looked up in an item's
+                            word sets instead ('terms_are_words')
+        """
+        alternatives = '|'.join(re.escape(text) for text in (*terms, *phrases))
+        return {
+            'terms': [(term, self._compile_search_term(term, substring_match)) for term in terms],
+            'terms_are_words': not substring_match and all(SEARCH_TOKEN_PATTERN.fullmatch(term) for term in terms),
+            'any': re.compile(alternatives if substring_match else r'\b(?:' + alternatives + r')\b'),
+        }
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _compile_search_term(term: str, substring_match: bool) -> re.Pattern:
+        """
+        Compile the pattern matching a search term. Patterns are kept for reuse by later searches
+        for the same term.
+        
+        Args:
+            term: Normalized search term
+            substring_match: Whether to use substring matching
+            
+        Returns:
+            re.Pattern: Compiled pattern for the term
+        """
+        escaped_term = re.escape(term)
+        return re.compile(escaped_term if substring_match else r'\b' + escaped_term + r'\b')
+
+    @staticmethod
+    def _contains_phrase(text: str, phrase: str, substring_match: bool) -> bool:
+        """
+        Check whether a phrase occurs in a text, with the same result as searching for the escaped
+        phrase, wrapped in regex word boundaries unless substring_match is set.
+        
+        Args:
+            text: Normalized text to search
+            phrase: Normalized phrase
+            substring_match: Whether to use substring matching
+            
+        Returns:
+            bool: True if the phrase occurs in the text
+        """
+        if substring_match:
+            return phrase in text
+        if not phrase:
+            return re.search(r'\b', text) is not None
+
+        def is_word_char(char: str) -> bool:
+            return char.isalnum() or char == '_'
+
+        # A word boundary sits between a word and a non-word character, and the text's ends count
+        # as non-word, so each end of a match must differ in kind from the character beyond it
+        starts_with_word = is_word_char(phrase[0])
+        ends_with_word = is_word_char(phrase[-1])
+        phrase_length = len(phrase)
+        text_length = len(text)
+        position = text.find(phrase)
+        while position != -1:
+            end = position + phrase_length
+            if (is_word_char(text[position - 1]) if position else False) != starts_with_word \
+                    and (is_word_char(text[end]) if end < text_length else False) != ends_with_word:
+                return True
+            position = text.find(phrase, position + 1)
+        return False
+
     def _sort_search_results(self, scored_results: List[Tuple[Dict[str, Any], int]]) -> List[Dict[str, Any]]:
         """
         Sort search results by relevance score.
@@ -789,7 +1282,9 @@ class KnowledgeBase:
         Returns:
             List[Dict[str, Any]]: Sorted list of items (highest score first)
         """
-        scored_results.sort(key=lambda x: x[1], reverse=True)
+        if not scored_results:
+            return []
+        scored_results.sort(key=itemgetter(1), reverse=True)
         return [item for item, _ in scored_results]
 
     def _parse_search_query(self, keywords: str) -> Tuple[List[str], List[str]]:
@@ -802,26 +1297,24 @@ class KnowledgeBase:
         Returns:
             tuple: (list of individual terms, list of quoted phrases)
         """
-        import re
-        
-        terms = []
         phrases = []
         
-        # Extract quoted phrases first
-        phrase_pattern = r'"([^"]+)"'
-        quoted_matches = re.findall(phrase_pattern, keywords)
-        phrases.extend([phrase.lower().strip() for phrase in quoted_matches])
-        
-        # Remove quoted phrases from the original string
-        keywords_without_phrases = re.sub(phrase_pattern, '', keywords)
+        # Extract quoted phrases, keeping the text around them in the same pass
+        remaining_parts = []
+        position = 0
+        for match in SEARCH_PHRASE_PATTERN.finditer(keywords):
+            phrases.append(match.group(1).lower().strip())
+            remaining_parts.append(keywords[position:match.start()])
+            position = match.end()
+        remaining_parts.append(keywords[position:])
         
-        # Extract individual words (excluding common boolean operators for now)
-        word_pattern = r'\b\w+\b'
-        word_matches = re.findall(word_pattern, keywords_without_phrases.lower())
+        # Extract individual words (excluding common boolean operators for now) from the text with
+        # the phrases removed. Text either side of a phrase is joined up, as it was when removing
+        # the phrases with re.sub
+        word_matches = SEARCH_TOKEN_PATTERN.findall(''.join(remaining_parts).lower())
         
         # Filter out very short words and common stop words
-        stop_words = {'and', 'or', 'not', 'the', 'a', 'an', 'is', 'are', 'was', 'were'}
-        terms.extend([word for word in word_matches if len(word) > 2 and word not in stop_words])
+        terms = [word for word in word_matches if len(word) > 2 and word not in SEARCH_STOP_WORDS]
         
         return terms, phrases
 
@@ -848,20 +1341,89 @@ class KnowledgeBase:
             int: Relevance score (0 = no match)
         """
         # Extract and normalize text fields
-        name = str(item.get("name", "")).lower()
-        description = str(item.get("description", "")).lower()
+        name, description = self._get_item_search_text(item)
+        return self._score_search_text(name, description, terms, phrases, substring_match, search_logic)
+
+    def _score_search_text(self, name: str, description: str, terms: List[str], phrases: List[str], substring_match: bool = False, search_logic: str = "AND",
+                           patterns: Optional[Dict[str, Any]] = None,
+                           tokens: Optional[Tuple[frozenset, frozenset]] = None) -> int:
+        """
+        Calculate relevance score for an item from its already lowercased name and description.
+        
+        Gives the same score as _find_term_matches, _apply_search_logic and _calculate_final_score
+        in turn, in a single pass that stops at the first missing term or phrase under AND logic.
+        
+        Args:
+            name: Normalized name text
+            description: Normalized description text
+            terms: List of search terms
+            phrases: List of quoted phrases
+            substring_match: If True, uses substring matching instead of word boundaries
+            search_logic: 'AND' requires all terms to match, 'OR' requires any term to match
+            patterns: Patterns from _compile_search_patterns, compiled here if not given
+            tokens: Sets of the words in the name and description, from the search index. When
+                    given, whole word terms are looked up in them rather than searched for
+            
+        Returns:
+            int: Relevance score (0 = no match)
+        """
+        if patterns is None:
+            patterns = self._compile_search_patterns(terms, phrases, substring_match)
+        
+        require_all = search_logic == "AND"
+        # Matches are counted once per distinct term or phrase, so a repeated one can never be
+        # matched as many times as AND logic requires
+        if require_all and (len(set(terms)) != len(terms) or len(set(phrases)) != len(phrases)):
+            return 0
+        
+        found_terms = set()
+        found_phrases = set()
+        name_matches = 0
+        desc_matches = 0
         
-        # Find all term and phrase matches
-        match_results = self._find_term_matches(name, description, terms, phrases, substring_match)
+        use_tokens = tokens is not None and patterns['terms_are_words']
+        if use_tokens:
+            name_tokens, desc_tokens = tokens
         
-        # Apply search logic filtering
-        if not self._apply_search_logic(match_results, terms, phrases, search_logic):
+        for term, pattern in patterns['terms']:
+            if use_tokens:
+                found_in_name = term in name_tokens
+                found_in_desc = term in desc_tokens
+            elif substring_match:
+                # The substring pattern is just the escaped term, so a plain substring test matches the same
+                found_in_name = term in name
+                found_in_desc = term in description
+            else:
+                found_in_name = pattern.search(name) is not None
+                found_in_desc = pattern.search(description) is not None
+            if not (found_in_name or found_in_desc):
+                if require_all:
+                    return 0
+                continue
+            found_terms.add(term)
+            name_matches += found_in_name
+            desc_matches += found_in_desc
+        
+        for phrase in phrases:
+            found_in_name = self._contains_phrase(name, phrase, substring_match)
+            found_in_desc = self._contains_phrase(description, phrase, substring_match)
+            if not (found_in_name or found_in_desc):
+                if require_all:
+                    return 0
+                continue
+            found_phrases.add(phrase)
+            # Phrases worth more
+            name_matches += 2 * found_in_name
+            desc_matches += 2 * found_in_desc
+        
+        total_found = len(found_terms) + len(found_phrases)
+        if not total_found:
             return 0
         
-        # Calculate final score
-        return self._calculate_final_score(match_results, terms, phrases, search_logic)
+        return self._weighted_search_score(name_matches, desc_matches, total_found, len(terms) + len(phrases), search_logic)
 
-    def _find_term_matches(self, name: str, description: str, terms: List[str], phrases: List[str], substring_match: bool) -> Dict[str, Any]:
+    def _find_term_matches(self, name: str, description: str, terms: List[str], phrases: List[str], substring_match: bool,
+                           patterns: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Find which terms and phrases match in name and description fields.
         
@@ -871,11 +1433,13 @@ class KnowledgeBase:
             terms: List of search terms
             phrases: List of quoted phrases
             substring_match: Whether to use substring matching
+            patterns: Patterns from _compile_search_patterns, compiled here if not given
             
         Returns:
             Dict[str, Any]: Dictionary containing match results
         """
-        import re
+        if patterns is None:
+            patterns = self._compile_search_patterns(terms, phrases, substring_match)
         
         found_terms = set()
         found_phrases = set()
@@ -883,11 +1447,9 @@ class KnowledgeBase:
         desc_matches = 0
         
         # Check individual terms
-        for term in terms:
-            pattern = re.escape(term) if substring_match else r'\b' + re.escape(term) + r'\b'
-            
-            found_in_name = bool(re.search(pattern, name))
-            found_in_desc = bool(re.search(pattern, description))
+        for term, pattern in patterns['terms']:
+            found_in_name = bool(pattern.search(name))
+            found_in_desc = bool(pattern.search(description))
             
             if found_in_name or found_in_desc:
                 found_terms.add(term)
@@ -899,11 +1461,8 @@ class KnowledgeBase:
         
         # Check phrases (worth more points)
         for phrase in phrases:
-            escaped_phrase = re.escape(phrase)
-            pattern = escaped_phrase if substring_match else r'\b' + escaped_phrase + r'\b'
-            
-            found_in_name = bool(re.search(pattern, name))
-            found_in_desc = bool(re.search(pattern, description))
+            found_in_name = self._contains_phrase(name, phrase, substring_match)
+            found_in_desc = self._contains_phrase(description, phrase, substring_match)
             
             if found_in_name or found_in_desc:
                 found_phrases.add(phrase)
@@ -956,23 +1515,31 @@ class KnowledgeBase:
         Returns:
             int: Final relevance score
         """
-        name_matches = match_results['name_matches']
-        desc_matches = match_results['desc_matches']
+        total_found = len(match_results['found_terms']) + len(match_results['found_phrases'])
+        return self._weighted_search_score(match_results['name_matches'], match_results['desc_matches'],
+                                           total_found, len(terms) + len(phrases), search_logic)
+
+    @staticmethod
+    def _weighted_search_score(name_matches: int, desc_matches: int, total_found: int, total_search_items: int,
+                               search_logic: str) -> int:
+        """
+        Calculate the weighted score for where, and how many of, the terms and phrases matched.
         
+        Args:
+            name_matches: Matches in the name (phrases count twice)
+            desc_matches: Matches in the description (phrases count twice)
+            total_found: Number of distinct terms and phrases found
+            total_search_items: Number of terms and phrases searched for
+            search_logic: 'AND' or 'OR'
+            
+        Returns:
+            int: Final relevance score
+        """
         # Calculate base score based on where matches were found
-        if name_matches > 0 and desc_matches > 0:
-            base_score = 100 + name_matches + desc_matches
-        elif name_matches > 0:
-            base_score = 50 + name_matches
-        elif desc_matches > 0:
-            base_score = 10 + desc_matches
-        else:
-            base_score = 0
+        base_score = SEARCH_BASE_SCORES[name_matches > 0, desc_matches > 0] + name_matches + desc_matches
         
         # For OR logic, apply multiplier based on match percentage
-        if search_logic == "OR" and len(terms) + len(phrases) > 1:
-            total_search_items = len(terms) + len(phrases)
-            total_found = len(match_results['found_terms']) + len(match_results['found_phrases'])
+        if search_logic == "OR" and total_search_items > 1:
             match_percentage = total_found / total_search_items
             # Scale score: 100% match gets full score, partial matches get reduced score
             # But ensure at least some score for any match
@@ -994,19 +1561,8 @@ class KnowledgeBase:
         Returns:
             List[str]: List of unique mitigation IDs associated with the technique
         """
-        mit_list_for_this_technique = []
-        technique = self.get_technique(technique_id)
-        if not technique:
-            return mit_list_for_this_technique
-            
-        for weakness_id in technique.get('weaknesses', []):
-            weakness_info = self.get_weakness(weakness_id)
-            if weakness_info:
-                for mitigation_id in weakness_info.get('mitigations', []):
-                    if mitigation_id not in mit_list_for_this_technique:
-                        mit_list_for_this_technique.append(mitigation_id)
-        
-        return mit_list_for_this_technique
+        # Copied so callers cannot change the pre-computed index
+        return list(self._technique_to_mitigations.get(technique_id, ()))
 
     def get_max_mitigations_per_technique(self) -> int:
         """
@@ -1016,12 +1572,7 @@ class KnowledgeBase:
         Returns:
             int: Maximum number of mitigations for any single technique
         """
-        max_mits = 0
-        for technique_id in self.techniques.keys():
-            mits = self.get_mit_list_for_technique(technique_id)
-            if len(mits) > max_mits:
-                max_mits = len(mits)
-        return max_mits
+        return max(map(len, self._technique_to_mitigations.values()), default=0)
 
     def list_tactics(self) -> List[str]:
         """
@@ -1031,7 +1582,7 @@ class KnowledgeBase:
         Returns:
             List[str]: List of objective names from current mapping
         """
-        objectives = self.list_objectives()
+        objectives = self._get_objectives()
         return [obj.get('name') for obj in objectives]
 
     @property 
@@ -1061,33 +1612,22 @@ class KnowledgeBase:
                       Returns an empty list if technique is not in any objectives.
         """
         active_mapping_name = mapping_name or self.current_mapping_name
-        objectives = self.list_objectives(active_mapping_name)
+        objectives = self._get_objectives(active_mapping_name)
         if not objectives:
             return []
 
         # Find objectives containing this technique
-        objective_names = []
-        for obj in objectives:
-            if technique_id in obj.get('techniques', []):
-                objective_names.append(obj.get('name'))
+        objective_names_by_technique = self._objective_names_by_technique[active_mapping_name]
+        objective_names = objective_names_by_technique.get(technique_id)
 
-        # If no objectives found, this might be a subtechnique - find parent
+        # If no objectives found, this might be a subtechnique - use its parent's objectives
         if not objective_names:
-            # Find parent by checking which technique has this ID in its subtechniques
-            parent_id = None
-            for t_id in self.list_techniques():
-                t = self.get_technique(t_id)
-                if t and technique_id in t.get('subtechniques', []):
-                    parent_id = t_id
-                    break
-
-            # If we found a parent, get its objectives
+            parent_id = self._subtechnique_to_parent.get(technique_id)
             if parent_id:
-                for obj in objectives:
-                    if parent_id in obj.get('techniques', []):
-                        objective_names.append(obj.get('name'))
+                objective_names = objective_names_by_technique.get(parent_id)
 
-        return objective_names
+        # Copied so callers cannot change the pre-computed index
+        return list(objective_names or ())
 
     def list_techniques(self) -> List[str]:
         """
@@ -1096,7 +1636,7 @@ class KnowledgeBase:
         Returns:
             List[str]: Sorted list of technique IDs
         """
-        return sorted(self.techniques.keys())
+        return list(self._get_sorted_ids('techniques', self.techniques))
 
     def list_weaknesses(self) -> List[str]:
         """
@@ -1105,7 +1645,7 @@ class KnowledgeBase:
         Returns:
             List[str]: Sorted list of weakness IDs
         """
-        return sorted(self.weaknesses.keys())
+        return list(self._get_sorted_ids('weaknesses', self.weaknesses))
 
     def list_mitigations(self) -> List[str]:
         """
@@ -1114,7 +1654,25 @@ class KnowledgeBase:
         Returns:
             List[str]: Sorted list of mitigation IDs
         """
-        return sorted(self.mitigations.keys())
+        return list(self._get_sorted_ids('mitigations', self.mitigations))
+
+    def _get_sorted_ids(self, collection_name: str, collection: Dict[str, Dict[str, Any]]) -> Tuple[str, ...]:
+        """
+        Get the sorted IDs of a collection, sorting them again only if the collection has been
+        replaced or resized since they were last sorted.
+
+        Args:
+            collection_name: Name of the collection ('techniques', 'weaknesses' or 'mitigations')
+            collection: The collection of items
+
+        Returns:
+            Tuple[str, ...]: Sorted IDs of the collection
+        """
+        cached = self._sorted_ids.get(collection_name)
+        if cached is None or cached[0] is not collection or len(cached[1]) != len(collection):
+            cached = (collection, tuple(sorted(collection)))
+            self._sorted_ids[collection_name] = cached
+        return cached[1]
 
     def get_techniques_for_mitigation(self, mitigation_id: str) -> List[Dict[str, Any]]:
         """
@@ -1141,19 +1699,55 @@ class KnowledgeBase:
         technique_ids = self._mitigation_to_techniques.get(mitigation_id, [])
 
         # Convert IDs to full technique objects
-        associated_techniques = []
-        for technique_id in technique_ids:
-            technique = self.get_technique(technique_id)
-            if technique:
-                associated_techniques.append(technique)
-            else:
-                logger.warning("Index inconsistency: technique %s not found", technique_id)
+        techniques = self.techniques
+        associated_techniques = [technique for technique_id in technique_ids if (technique := techniques.get(technique_id)) is not None]
+        if len(associated_techniques) != len(technique_ids) and logger.isEnabledFor(logging.WARNING):
+            for technique_id in technique_ids:
+                if technique_id not in techniques:
+                    logger.warning("Index inconsistency: technique %s not found", technique_id)
 
         if not associated_techniques:
             logger.debug("No techniques found that reference mitigation %s.", mitigation_id)
 
         return associated_techniques
 
+    def get_mitigations_for_technique(self, technique_id: str) -> List[Dict[str, Any]]:
+        """
+        Retrieves all mitigations associated with a specific technique through its weaknesses.
+        Uses pre-computed index.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            List[Dict[str, Any]]: A list of mitigation data dictionaries, sorted by ID, for the
+                weaknesses of the technique. Returns an empty list if the technique is not found
+                or none of its weaknesses have mitigations.
+        """
+        # First check if the technique exists
+        if not self.get_technique(technique_id):
+            logger.warning(
+                "Technique %s not found when searching for associated mitigations.",
+                technique_id
+            )
+            return []
+
+        # Lookup using pre-computed index
+        mitigation_ids = sorted(self._technique_to_mitigations.get(technique_id, ()))
+
+        # Convert IDs to full mitigation objects
+        mitigations = self.mitigations
+        associated_mitigations = [mitigation for mitigation_id in mitigation_ids if (mitigation := mitigations.get(mitigation_id)) is not None]
+        if len(associated_mitigations) != len(mitigation_ids) and logger.isEnabledFor(logging.WARNING):
+            for mitigation_id in mitigation_ids:
+                if mitigation_id not in mitigations:
+                    logger.warning("Index inconsistency: mitigation %s not found", mitigation_id)
+
+        if not associated_mitigations:
+            logger.debug("No mitigations found for technique %s.", technique_id)
+
+        return associated_mitigations
+
     # --- Extension Methods ---
 
     def _load_extensions(self):
@@ -1171,7 +1765,7 @@ class KnowledgeBase:
             return
 
         try:
-            with open(extension_config_path, 'r', encoding='utf-8') as f:
+            with open(extension_config_path, 'rb') as f:
                 self.extension_config = json.load(f)
 
             # Validate config structure
@@ -1290,45 +1884,58 @@ class KnowledgeBase:
             items_dict: Dictionary of loaded items to augment with extension data
         """
         item_type_path = os.path.join(extension_path, item_type)
-        if not os.path.exists(item_type_path):
+
+        # Only items with a folder in the extension can have extension data, so list the folders
+        # once rather than checking for a file for every loaded item
+        try:
+            with os.scandir(item_type_path) as entries:
+                item_folders = {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning("Failed to list %s folder in extension '%s': %s", item_type, extension_name, e)
             return
 
         for item_id in items_dict.keys():
+            if item_id not in item_folders:
+                continue
             extension_data_file = os.path.join(item_type_path, item_id, 'extension_data.json')
-            if os.path.exists(extension_data_file):
-                try:
-                    with open(extension_data_file, 'r', encoding='utf-8') as f:
-                        extension_data = json.load(f)
-
-                    # Initialize extension_data dict if it doesn't exist
-                    if 'extension_data' not in items_dict[item_id]:
-                        items_dict[item_id]['extension_data'] = {}
-
-                    # Add this extension's data
-                    items_dict[item_id]['extension_data'][extension_name] = extension_data
-                    logger.debug(
-                        "Loaded extension_data.json for %s '%s' from extension '%s'",
-                        item_type[:-1],  # Remove trailing 's'
-                        item_id,
-                        extension_name
-                    )
+            try:
+                with open(extension_data_file, 'rb') as f:
+                    extension_data = json.load(f)
+
+                # Initialize extension_data dict if it doesn't exist
+                if 'extension_data' not in items_dict[item_id]:
+                    items_dict[item_id]['extension_data'] = {}
+
+                # Add this extension's data
+                items_dict[item_id]['extension_data'][extension_name] = extension_data
+                logger.debug(
+                    "Loaded extension_data.json for %s '%s' from extension '%s'",
+                    item_type[:-1],  # Remove trailing 's'
+                    item_id,
+                    extension_name
+                )
 
-                except json.JSONDecodeError as e:
-                    logger.warning(
-                        "Failed to decode extension_data.json for %s '%s' in extension '%s': %s",
-                        item_type[:-1],
-                        item_id,
-                        extension_name,
-                        e
-                    )
-                except IOError as e:
-                    logger.warning(
-                        "Failed to read extension_data.json for %s '%s' in extension '%s': %s",
-                        item_type[:-1],
-                        item_id,
-                        extension_name,
-                        e
-                    )
+            except FileNotFoundError:
+                # The item's folder has no extension_data.json
+                continue
+            except json.JSONDecodeError as e:
+                logger.warning(
+                    "Failed to decode extension_data.json for %s '%s' in extension '%s': %s",
+                    item_type[:-1],
+                    item_id,
+                    extension_name,
+                    e
+                )
+            except IOError as e:
+                logger.warning(
+                    "Failed to read extension_data.json for %s '%s' in extension '%s': %s",
+                    item_type[:-1],
+                    item_id,
+                    extension_name,
+                    e
+                )
 
     def _resolve_extension_path(self, extension_path: str) -> Optional[str]:
         """
@@ -1447,35 +2054,93 @@ class KnowledgeBase:
         if not self.has_extensions():
             return ""
 
-        result = None
-        first_result = True
+        results = []
 
-        for extension_name, module in self.extension_modules.items():
-            if hasattr(module, function_name):
-                try:
-                    func_result = getattr(module, function_name)(*args, **kwargs)
-
-                    if func_result is not None:
-                        if first_result:
-                            result = func_result
-                            first_result = False
-                        else:
-                            # If result is a string, concatenate; otherwise, chain (for Excel)
-                            if isinstance(result, str):
-                                result += str(func_result)
-                            else:
-                                # For non-string results (like Excel worksheets), use the latest result
-                                # The extension should have modified and returned the object
-                                result = func_result
-                except Exception as e:
-                    logger.error(
-                        "Error calling %s in extension '%s': %s",
-                        function_name,
-                        extension_name,
-                        e
-                    )
+        for extension_name, function in self._get_extension_handlers(function_name):
+            try:
+                func_result = function(*args, **kwargs)
+
+                if func_result is not None:
+                    results.append(func_result)
+            except Exception as e:
+                self._log_extension_error(function_name, extension_name, e)
+
+        if not results:
+            return ""
+
+        # If the first result is a string, concatenate them all in one join; otherwise, chain (for Excel)
+        if isinstance(results[0], str):
+            return "".join(map(str, results))
+
+        # For non-string results (like Excel worksheets), use the latest result
+        # The extension should have modified and returned the object
+        return results[-1]
 
-        return result if result is not None else ""
+    def _log_extension_error(self, function_name: str, extension_name: str, error: Exception):
+        """
+        Log an error raised by an extension function.
+
+        Only the 1st, 2nd, 4th, 8th... failure of each extension function is logged, so an extension
+        that fails for every item does not flood the log while a report is generated.
+
+        Args:
+            function_name: The name of the function that was called
+            extension_name: The name of the extension it was called in
+            error: The exception raised
+        """
+        key = (extension_name, function_name)
+        count = self._extension_error_counts.get(key, 0) + 1
+        self._extension_error_counts[key] = count
+        if count & (count - 1) == 0:
+            logger.error(
+                "Error calling %s in extension '%s' (failure %d): %s",
+                function_name,
+                extension_name,
+                count,
+                error
+            )
+
+    def _get_extension_handlers(self, function_name: str) -> List[Tuple[str, Any]]:
+        """
+        Get the (extension name, function) pairs of the loaded extensions that define a function.
+
+        Args:
+            function_name: The name of the function
+
+        Returns:
+            List of (extension name, function) tuples, in extension load order
+        """
+        handlers = self._extension_dispatch.get(function_name)
+        if handlers is None:
+            handlers = [
+                (extension_name, getattr(module, function_name))
+                for extension_name, module in self.extension_modules.items()
+                if hasattr(module, function_name)
+            ]
+            self._extension_dispatch[function_name] = handlers
+        return handlers
+
+    def _chain_excel_extension_function(self, function_name: str, excel_worksheet, start_row, *args):
+        """
+        Call an Excel function across all loaded extensions, passing the worksheet returned by
+        each extension on to the next.
+
+        Args:
+            function_name: The name of the function to call in each extension
+            excel_worksheet: The Excel worksheet object to modify
+            start_row: The starting row number
+            *args: Positional arguments passed to the function before the worksheet (e.g. the item ID)
+
+        Returns:
+            The worksheet returned by the last extension, or excel_worksheet if none returned one
+        """
+        for extension_name, function in self._get_extension_handlers(function_name):
+            try:
+                excel_worksheet = function(*args, excel_worksheet, start_row, kb=self) or excel_worksheet
+            except Exception as e:
+                self._log_extension_error(function_name, extension_name, e)
+
+        return excel_worksheet
 
     def display_extension_info(self):
         """
@@ -1490,8 +2155,9 @@ class KnowledgeBase:
             return
 
         # Display technique_fields visibility settings
-        if 'technique_fields' in self.extension_config:
-            for field_name, is_visible in self.extension_config.get('technique_fields').items():
+        technique_fields = self.extension_config.get('technique_fields')
+        if technique_fields:
+            for field_name, is_visible in technique_fields.items():
                 if is_visible is False:
                     print(f"- config: field '{field_name}' display set to false")
 
@@ -1514,14 +2180,8 @@ class KnowledgeBase:
         Returns:
             bool: True if the field should be displayed, False otherwise
         """
-        if not self._extensions_enabled or self.extension_config is None:
-            return True  # Default to showing all fields if no config
-
-        if 'technique_fields' not in self.extension_config:
-            return True  # Default to showing all fields if technique_fields not configured
-
-        # Return the field's visibility setting, defaulting to True if not specified
-        return self.extension_config.get('technique_fields').get(field_name, True)
+        # Fields are shown unless the config's technique_fields turns them off (all are shown without a config)
+        return field_name not in self._hidden_fields
 
     def add_markdown_to_main_page(self) -> str:
         """
@@ -1530,6 +2190,8 @@ class KnowledgeBase:
         Returns:
             str: Concatenated markdown content from all extensions
         """
+        if not self._extensions_active:
+            return ""
         return self.call_extension_function('get_markdown_generic', kb=self)
 
     def add_markdown_to_technique(self, technique_id: str) -> str:
@@ -1542,6 +2204,8 @@ class KnowledgeBase:
         Returns:
             str: Concatenated markdown content from all extensions
         """
+        if not self._extensions_active:
+            return ""
         return self.call_extension_function('get_markdown_for_technique', technique_id, kb=self)
 
     def add_markdown_to_technique_preview_suffix(self, technique_id: str) -> str:
@@ -1554,6 +2218,8 @@ class KnowledgeBase:
         Returns:
             str: Concatenated markdown content from all extensions
         """
+        if not self._extensions_active:
+            return ""
         return self.call_extension_function('get_markdown_for_technique_suffix', technique_id, kb=self)
 
     def add_markdown_to_weakness(self, weakness_id: str) -> str:
@@ -1566,6 +2232,8 @@ class KnowledgeBase:
         Returns:
             str: Concatenated markdown content from all extensions
         """
+        if not self._extensions_active:
+            return ""
         return self.call_extension_function('get_markdown_for_weakness', weakness_id, kb=self)
 
     def add_markdown_to_weakness_preview_prefix(self, weakness_id: str) -> str:
@@ -1578,6 +2246,8 @@ class KnowledgeBase:
         Returns:
             str: Concatenated markdown content from all extensions
         """
+        if not self._extensions_active:
+            return ""
         return self.call_extension_function('get_markdown_for_weakness_prefix', weakness_id, kb=self)
 
     def add_markdown_to_weakness_preview_suffix(self, weakness_id: str) -> str:
@@ -1590,6 +2260,8 @@ class KnowledgeBase:
         Returns:
             str: Concatenated markdown content from all extensions
         """
+        if not self._extensions_active:
+            return ""
         return self.call_extension_function('get_markdown_for_weakness_suffix', weakness_id, kb=self)
 
     def add_markdown_to_mitigation(self, mitigation_id: str) -> str:
@@ -1602,6 +2274,8 @@ class KnowledgeBase:
         Returns:
             str: Concatenated markdown content from all extensions
         """
+        if not self._extensions_active:
+            return ""
         return self.call_extension_function('get_markdown_for_mitigation', mitigation_id, kb=self)
 
     def add_markdown_to_mitigation_preview_prefix(self, mitigation_id: str) -> str:
@@ -1614,6 +2288,8 @@ class KnowledgeBase:
         Returns:
             str: Concatenated markdown content from all extensions
         """
+        if not self._extensions_active:
+            return ""
         return self.call_extension_function('get_markdown_for_mitigation_prefix', mitigation_id, kb=self)
 
     def add_markdown_to_mitigation_preview_suffix(self, mitigation_id: str) -> str:
@@ -1626,6 +2302,8 @@ class KnowledgeBase:
         Returns:
             str: Concatenated markdown content from all extensions
         """
+        if not self._extensions_active:
+            return ""
         return self.call_extension_function('get_markdown_for_mitigation_suffix', mitigation_id, kb=self)
 
     def add_excel_to_generic(self, excel_worksheet, start_row):
@@ -1639,8 +2317,9 @@ class KnowledgeBase:
         Returns:
             The modified Excel worksheet object
         """
-        result = self.call_extension_function('get_excel_generic', excel_worksheet, start_row, kb=self)
-        return result if result else excel_worksheet
+        if not self._extensions_active:
+            return excel_worksheet
+        return self._chain_excel_extension_function('get_excel_generic', excel_worksheet, start_row)
 
     def add_excel_to_technique(self, technique_id: str, excel_worksheet, start_row):
         """
@@ -1654,8 +2333,9 @@ class KnowledgeBase:
         Returns:
             The modified Excel worksheet object
         """
-        result = self.call_extension_function('get_excel_for_technique', technique_id, excel_worksheet, start_row, kb=self)
-        return result if result else excel_worksheet
+        if not self._extensions_active:
+            return excel_worksheet
+        return self._chain_excel_extension_function('get_excel_for_technique', excel_worksheet, start_row, technique_id)
 
     def add_excel_to_weakness(self, weakness_id: str, excel_worksheet, start_row):
         """
@@ -1669,8 +2349,9 @@ class KnowledgeBase:
         Returns:
             The modified Excel worksheet object
         """
-        result = self.call_extension_function('get_excel_for_weakness', weakness_id, excel_worksheet, start_row, kb=self)
-        return result if result else excel_worksheet
+        if not self._extensions_active:
+            return excel_worksheet
+        return self._chain_excel_extension_function('get_excel_for_weakness', excel_worksheet, start_row, weakness_id)
 
     def add_excel_to_mitigation(self, mitigation_id: str, excel_worksheet, start_row):
         """
@@ -1684,8 +2365,9 @@ class KnowledgeBase:
         Returns:
             The modified Excel worksheet object
         """
-        result = self.call_extension_function('get_excel_for_mitigation', mitigation_id, excel_worksheet, start_row, kb=self)
-        return result if result else excel_worksheet
+        if not self._extensions_active:
+            return excel_worksheet
+        return self._chain_excel_extension_function('get_excel_for_mitigation', excel_worksheet, start_row, mitigation_id)
 
     def get_colour_for_technique(self, technique_id: str) -> str:
         """
@@ -1708,18 +2390,7 @@ class KnowledgeBase:
             return self.global_config.get_colour_for_technique(self, technique_id)
 
         # Default implementation if no config is loaded
-        technique = self.get_technique(technique_id)
-        if not technique:
-            return "#F4CCCC"
-
-        if len(technique.get('weaknesses', [])) == 0:
-            return "#F4CCCC"
-
-        description = technique.get('description', '')
-        if not description or len(self.get_mit_list_for_technique(technique_id)) == 0:
-            return "#FCE5CD"
-
-        return "#D9EAD3"
+        return TECHNIQUE_STATUS_COLOURS[self._get_technique_status(technique_id)]
 
     def get_technique_prefix(self, technique_id: str) -> str:
         """
@@ -1742,18 +2413,33 @@ class KnowledgeBase:
             return self.global_config.get_technique_prefix(self, technique_id)
 
         # Default implementation if no config is loaded
-        technique = self.get_technique(technique_id)
-        if not technique:
-            return "🔴 "
+        return TECHNIQUE_STATUS_PREFIXES[self._get_technique_status(technique_id)]
 
-        if len(technique.get('weaknesses', [])) == 0:
-            return "🔴 "
+    def _get_technique_status(self, technique_id: str) -> int:
+        """
+        Classify how complete a technique is, for the default colour and prefix.
+
+        Args:
+            technique_id: The ID of the technique
 
-        description = technique.get('description', '')
-        if not description or len(self.get_mit_list_for_technique(technique_id)) == 0:
-            return "🟡 "
+        Returns:
+            int: 0 for a placeholder (no weaknesses), 1 if partially populated (missing description
+            or mitigations), 2 for a release candidate
+        """
+        technique = self.get_technique(technique_id)
+        cached = self._technique_statuses.get(technique_id)
+        if cached is not None and cached[0] is technique:
+            return cached[1]
+
+        if not technique or len(technique.get('weaknesses', [])) == 0:
+            status = 0
+        elif not technique.get('description', '') or len(self._technique_to_mitigations.get(technique_id, ())) == 0:
+            status = 1
+        else:
+            status = 2
 
-        return "🟢 "
+        self._technique_statuses[technique_id] = (technique, status)
+        return status
 
     def get_technique_suffix(self, technique_id: str) -> str:
         """
@@ -17,12 +17,16 @@ Note: Some tests include logging output (warnings) which are expected behavior
 when testing error handling with non-existent IDs.
 """
 
+import json
+import shutil
+import tempfile
 import unittest
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
 
 from solve_it_library import KnowledgeBase
+from solve_it_library.models import Technique, Weakness, Mitigation
 
 class MyTestCase(unittest.TestCase):
     """
@@ -39,6 +43,59 @@ class MyTestCase(unittest.TestCase):
         kb = KnowledgeBase('.', 'solve-it.json')
         self.assertEqual(type(kb), KnowledgeBase)
 
+    def test_kb_cache(self):
+        """
+        Test that the core data cache gives the same data and is refreshed when a data file changes.
+
+        Expected outcome: A second KnowledgeBase loaded from the cache matches one loaded from
+        the data files, and editing a technique file is picked up on the next load.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            shutil.copytree('data', os.path.join(temp_dir, 'data'))
+
+            uncached_kb = KnowledgeBase(temp_dir, 'solve-it.json', use_cache=False)
+            self.assertFalse(os.path.exists(os.path.join(temp_dir, KnowledgeBase.CACHE_FILE)))
+
+            KnowledgeBase(temp_dir, 'solve-it.json')
+            self.assertTrue(os.path.exists(os.path.join(temp_dir, KnowledgeBase.CACHE_FILE)))
+
+            cached_kb = KnowledgeBase(temp_dir, 'solve-it.json')
+            self.assertEqual(uncached_kb.techniques, cached_kb.techniques)
+            self.assertEqual(uncached_kb.weaknesses, cached_kb.weaknesses)
+            self.assertEqual(uncached_kb.mitigations, cached_kb.mitigations)
+            self.assertEqual(uncached_kb.get_techniques_for_weakness('W1001'),
+                             cached_kb.get_techniques_for_weakness('W1001'))
+
+            technique_path = os.path.join(temp_dir, 'data', 'techniques', 'T1002.json')
+            with open(technique_path, encoding='utf-8') as f:
+                technique = json.load(f)
+            technique['name'] = 'Renamed technique'
+            with open(technique_path, 'w', encoding='utf-8') as f:
+                json.dump(technique, f)
+
+            kb = KnowledgeBase(temp_dir, 'solve-it.json')
+            self.assertEqual(kb.get_technique('T1002')['name'], 'Renamed technique')
+
+    def test_loaded_items_match_model_dump(self):
+        """
+        Test that the loaded item dicts match the model_dump output of each validated data file.
+
+        Expected outcome: Every technique, weakness and mitigation holds exactly the keys and
+        values that model_dump gives for its file, so no field coercion is lost by taking the
+        dicts from the validated models directly.
+        """
+        kb = KnowledgeBase('.', 'solve-it.json', use_cache=False)
+        for folder, model_class, items in [('techniques', Technique, kb.techniques),
+                                           ('weaknesses', Weakness, kb.weaknesses),
+                                           ('mitigations', Mitigation, kb.mitigations)]:
+            folder_path = os.path.join('data', folder)
+            for filename in os.listdir(folder_path):
+                if not filename.endswith('.json'):
+                    continue
+                with open(os.path.join(folder_path, filename), 'rb') as f:
+                    expected = model_class.model_validate_json(f.read()).model_dump()
+                self.assertEqual(items[expected['id']], expected)
+
     def test_list_retrieval(self):
         """
         Test that all list methods return the correct data type.
@@ -397,6 +454,23 @@ class MyTestCase(unittest.TestCase):
             self.assertIn('id', weakness)
             self.assertIn('name', weakness)
 
+    def test_get_mitigations_for_technique(self):
+        """
+        Test lookup of the mitigations for a technique through its weaknesses.
+        
+        Expected outcome:
+        - T1002 should return the same mitigations as get_mit_list_for_technique, sorted by ID
+        - Should return list of mitigation dictionaries
+        - An unknown technique should return an empty list
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        mitigations = kb.get_mitigations_for_technique('T1002')
+        self.assertIsInstance(mitigations, list)
+        self.assertGreater(len(mitigations), 0)
+        mitigation_ids = [m['id'] for m in mitigations]
+        self.assertEqual(mitigation_ids, sorted(kb.get_mit_list_for_technique('T1002')))
+        self.assertEqual(kb.get_mitigations_for_technique('T9999'), [])
+
     # Bulk Data Retrieval Tests
 
     def test_get_all_weaknesses_with_name_and_id(self):
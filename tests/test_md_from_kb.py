@@ -0,0 +1,36 @@
+import unittest
+import tempfile
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solve_it_library import KnowledgeBase, SOLVEITDataError
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'reporting_scripts'))
+import generate_md_from_kb
+
+class MyTestCase(unittest.TestCase):
+    def test_objective_name_to_friendly_id(self):
+        self.assertEqual(generate_md_from_kb.objective_name_to_friendly_id("Acquire data"), "acquire-data")
+        self.assertEqual(generate_md_from_kb.objective_name_to_friendly_id("Access partitions, volumes and file systems data"),
+                         "access-partitions-volumes-and-file-systems-data")
+        self.assertEqual(generate_md_from_kb.objective_name_to_friendly_id("Extract artifacts, or content of specific types"),
+                         "extract-artifacts-or-content-of-specific-types")
+        self.assertEqual(generate_md_from_kb.objective_name_to_friendly_id("O_S's data v1.2"), "oss-data-v12")
+
+    def test_get_weakness_categories(self):
+        weakness = {'INCOMP': 'x', 'INAC_EX': '', 'INAC_AS': None, 'INAC_ALT': 'X', 'INAC_COR': 'no', 'MISINT': 'x'}
+        self.assertEqual(generate_md_from_kb.get_weakness_categories(weakness), "INCOMP, INAC-ALT, MISINT")
+        self.assertEqual(generate_md_from_kb.get_weakness_categories({}), "")
+
+    def test_missing_weakness_raises_data_error(self):
+        kb = KnowledgeBase('.', 'solve-it.json')
+        kb.techniques['T1002']['weaknesses'].append('W9999')
+
+        with tempfile.TemporaryDirectory() as out_folder:
+            os.makedirs(os.path.join(out_folder, 'md_content'))
+            with self.assertRaises(SOLVEITDataError):
+                generate_md_from_kb.write_all_technique_files(kb, os.path.join(out_folder, 'solve-it.md'))
+
+
+if __name__ == '__main__':
+    unittest.main()
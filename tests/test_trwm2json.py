@@ -4,7 +4,7 @@ import os
 import sys
 print(os.path.abspath(os.path.curdir))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'reporting_scripts'))
-from trwm2json import parse_field_data, find_mitigation_id_by_name, technique_tsv_to_json, mitigations_tsv_to_json, weaknesses_tsv_to_json, process_weakness_mitigations
+from trwm2json import parse_field_data, find_mitigation_id_by_name, build_mitigation_name_index, technique_tsv_to_json, mitigations_tsv_to_json, weaknesses_tsv_to_json, process_weakness_mitigations
 
 
 class TestParseFieldData(unittest.TestCase):
@@ -71,6 +71,15 @@ class TestFindMitigationIdByName(unittest.TestCase):
         result = find_mitigation_id_by_name("new mitigation 1", self.mitigations)
         self.assertEqual(result, "Mx001")
     
+    def test_case_folded_match(self):
+        """Test that non-ASCII names are compared with full case folding"""
+        mitigations = [{"id": "M1099", "name": "Verify Straße data", "technique": ""}]
+        result = find_mitigation_id_by_name("VERIFY STRASSE DATA", mitigations)
+        self.assertEqual(result, "M1099")
+        
+        name_to_id = build_mitigation_name_index(mitigations)
+        self.assertEqual(name_to_id.get("verify strasse data"), "M1099")
+    
     def test_whitespace_handling(self):
         """Test that whitespace is handled correctly"""
         result = find_mitigation_id_by_name("  Dual tool verification  ", self.mitigations)